@@ -28,7 +28,7 @@ def main():
     
     args = parser.parse_args()
     
-    config = Config()
+    config = Config
     db = NotamDatabase(config.DATABASE_PATH)
     repo = AerodromeRepository(db)
     
@@ -56,12 +56,13 @@ def main():
     # Show stats
     with db.get_connection() as conn:
         cursor = conn.cursor()
-        cursor.execute("SELECT COUNT(*) FROM aerodromes")
-        total = cursor.fetchone()[0]
-        cursor.execute("SELECT COUNT(*) FROM aerodromes WHERE source='ourairports'")
-        ourairports = cursor.fetchone()[0]
-        cursor.execute("SELECT COUNT(*) FROM aerodromes WHERE source='notam_inference'")
-        inferred = cursor.fetchone()[0]
+        cursor.execute("""
+            SELECT COUNT(*),
+                   COALESCE(SUM(source = 'ourairports'), 0),
+                   COALESCE(SUM(source = 'notam_inference'), 0)
+            FROM aerodromes
+        """)
+        total, ourairports, inferred = cursor.fetchone()
     
     logger.info(f"Total in database: {total} ({ourairports} from OurAirports, {inferred} inferred)")
 
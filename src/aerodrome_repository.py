@@ -1,10 +1,18 @@
 """Aerodrome repository for caching ICAO airport data."""
+import atexit
 import csv
+import functools
 import logging
 import os
+import re
+import shutil
+import sqlite3
+import threading
 import urllib.request
 from datetime import datetime
-from typing import Optional, Dict, List, Any
+from itertools import islice
+from types import MappingProxyType
+from typing import Optional, Dict, List, Any, Iterable, Iterator, Tuple
 from contextlib import contextmanager
 
 from src.config import Config
@@ -13,6 +21,65 @@ from src.models.notam import Notam
 
 logger = logging.getLogger(__name__)
 
+# Four ASCII letters - the OurAirports idents that are real ICAO codes
+_ICAO_IDENT_MATCH = re.compile(r'[A-Za-z]{4}\Z').match
+
+# Minimal ISO country code to name mapping - expand as needed
+_COUNTRY_CODE_TO_NAME = MappingProxyType({
+    'US': 'United States',
+    'CA': 'Canada',
+    'GB': 'United Kingdom',
+    'FR': 'France',
+    'DE': 'Germany',
+    'JP': 'Japan',
+    'CN': 'China',
+    'AU': 'Australia',
+    'BR': 'Brazil',
+    'ZA': 'South Africa',
+    'AE': 'United Arab Emirates',
+    'SG': 'Singapore',
+    'DK': 'Denmark',
+    'NO': 'Norway',
+    'SE': 'Sweden',
+    'FI': 'Finland',
+    'PL': 'Poland',
+    'LT': 'Lithuania',
+    'EE': 'Estonia',
+    'LV': 'Latvia',
+    'HU': 'Hungary',
+    'CZ': 'Czech Republic',
+    'AT': 'Austria',
+    'GR': 'Greece',
+    'TR': 'Turkey',
+    'IL': 'Israel',
+    'OM': 'Oman',
+    'SA': 'Saudi Arabia',
+    'IR': 'Iran',
+    'IQ': 'Iraq',
+    'KE': 'Kenya',
+    'EG': 'Egypt',
+    'ET': 'Ethiopia',
+    'JO': 'Jordan',
+    'BH': 'Bahrain',
+    'QA': 'Qatar',
+    'BD': 'Bangladesh',
+    'NP': 'Nepal',
+    'TH': 'Thailand',
+    'VN': 'Vietnam',
+    'PH': 'Philippines',
+    'ID': 'Indonesia',
+    'MY': 'Malaysia',
+    'NZ': 'New Zealand',
+    'MX': 'Mexico',
+    'AR': 'Argentina',
+    'CO': 'Colombia',
+    'CL': 'Chile',
+    'PE': 'Peru',
+    'UY': 'Uruguay',
+    'PY': 'Paraguay',
+    'BO': 'Bolivia',
+})
+
 
 class AerodromeRepository:
     """
@@ -24,16 +91,73 @@ class AerodromeRepository:
     # OurAirports CSV URL
     OURAIRPORTS_URL = "https://davidmegginson.github.io/ourairports-data/airports.csv"
     
-    def __init__(self, db: NotamDatabase):
+    # Read/write buffer for streaming the CSV download to disk
+    DOWNLOAD_CHUNK_SIZE = 1 << 20
+    
+    # Rows per executemany() call during CSV load
+    LOAD_BATCH_SIZE = 10000
+    
+    # Aerodromes kept in the in-process lookup cache
+    CACHE_SIZE = 4096
+    
+    # Pending inferred aerodromes that trigger a write
+    INFER_FLUSH_SIZE = 256
+    
+    # Codes per IN (...) query in get_many; stays under SQLite's variable limit
+    LOOKUP_CHUNK_SIZE = 500
+    
+    # Rows loaded from CSV above which table statistics are refreshed
+    ANALYZE_THRESHOLD = 1000
+    
+    _UPSERT_AERODROME_SQL = '''
+        INSERT OR REPLACE INTO aerodromes (
+            icao_code, iata_code, name, type,
+            latitude, longitude, elevation_ft,
+            continent, country_code, country_name,
+            region, municipality, gps_code, source,
+            updated_at
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    '''
+    
+    def __init__(self, db: NotamDatabase, preload: bool = True):
         """
         Initialize repository.
         
         Args:
             db: Database instance for storage and lookup
+            preload: If True, hold the whole aerodromes table in memory and
+                serve lookups from it; otherwise use a per-code LRU cache
         """
         self.db = db
-        self.config = Config()
+        self.config = Config
+        # Full in-memory copy of the table, keyed by ICAO code (see load_index)
+        self._index: Optional[Dict[str, sqlite3.Row]] = None
+        # Per-instance cache of DB lookups (misses included); cleared on writes
+        self._get_cached = functools.lru_cache(maxsize=self.CACHE_SIZE)(self._fetch)
+        # Write-behind buffer for inferred aerodromes (see infer_from_notam)
+        self._infer_buffer: List[Tuple] = []
+        self._buffer_lock = threading.Lock()
+        # Write whatever is still buffered when the process exits
+        atexit.register(self.flush_inferences)
         self._ensure_table()
+        if preload:
+            self.load_index()
+    
+    def load_index(self) -> int:
+        """
+        Load the whole aerodromes table into memory.
+        
+        Returns:
+            Number of aerodromes indexed
+        """
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT * FROM aerodromes')
+            self._index = {row['icao_code']: row for row in cursor}
+        
+        self._get_cached.cache_clear()
+        logger.debug(f"Indexed {len(self._index)} aerodromes in memory")
+        return len(self._index)
     
     def _ensure_table(self):
         """Ensure aerodromes table exists."""
@@ -60,39 +184,77 @@ class AerodromeRepository:
                 )
             ''')
             
-            # Index for faster lookups
-            cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_aerodromes_icao 
-                ON aerodromes(icao_code)
-            ''')
+            # icao_code is the PRIMARY KEY, which already has its own index;
+            # drop the duplicate one older databases were created with
+            cursor.execute('DROP INDEX IF EXISTS idx_aerodromes_icao')
             
             logger.debug("Aerodromes table ensured")
     
-    def get(self, icao_code: str) -> Optional[Dict[str, Any]]:
+    def get(self, icao_code: str) -> Optional[sqlite3.Row]:
         """
-        Get aerodrome by ICAO code (DB-first lookup).
+        Get aerodrome by ICAO code (in-memory index or cache, then DB lookup).
         
         Args:
             icao_code: ICAO airport code (e.g., 'KATL')
             
         Returns:
-            Aerodrome dict or None if not found
+            Aerodrome row (read-only, mapping-style access) or None if not found
         """
         if not icao_code:
             return None
         
+        # Rows are immutable, so cached entries can be handed out as-is
+        if self._index is not None:
+            return self._index.get(icao_code.upper())
+        return self._get_cached(icao_code.upper())
+    
+    def _fetch(self, icao_code: str) -> Optional[sqlite3.Row]:
+        """Look up a single upper-cased ICAO code in the database."""
         with self.db.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 'SELECT * FROM aerodromes WHERE icao_code = ?',
-                (icao_code.upper(),)
+                (icao_code,)
             )
-            row = cursor.fetchone()
+            return cursor.fetchone()
+    
+    def get_many(self, icao_codes: Iterable[str]) -> Dict[str, sqlite3.Row]:
+        """
+        Get several aerodromes in as few round-trips as possible.
+        
+        Args:
+            icao_codes: ICAO airport codes (case-insensitive, duplicates ignored)
             
-            if row:
-                return dict(row)
+        Returns:
+            Dict mapping upper-cased ICAO code to aerodrome row; codes that
+            are not in the table are absent
+        """
+        codes = list(dict.fromkeys(code.upper() for code in icao_codes if code))
+        if not codes:
+            return {}
         
-        return None
+        if self._index is not None:
+            index = self._index
+            return {code: index[code] for code in codes if code in index}
+        
+        return self._select_many(codes)
+    
+    def _select_many(self, codes: List[str]) -> Dict[str, sqlite3.Row]:
+        """Fetch aerodromes by code with chunked IN (...) queries."""
+        result = {}
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            for i in range(0, len(codes), self.LOOKUP_CHUNK_SIZE):
+                chunk = codes[i:i + self.LOOKUP_CHUNK_SIZE]
+                placeholders = ','.join('?' * len(chunk))
+                cursor.execute(
+                    f'SELECT * FROM aerodromes WHERE icao_code IN ({placeholders})',
+                    chunk
+                )
+                for row in cursor.fetchall():
+                    result[row['icao_code']] = row
+        
+        return result
     
     def load_from_csv(self, csv_path: Optional[str] = None) -> int:
         """
@@ -111,58 +273,122 @@ class AerodromeRepository:
             return 0
         
         count = 0
-        with open(path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
+        
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if not header:
+                logger.warning(f"CSV file is empty: {path}")
+                return 0
             
-            with self.db.get_connection() as conn:
+            # Resolve column positions once; the row loop only indexes lists
+            positions = {name: i for i, name in enumerate(header)}
+            try:
+                columns = tuple(positions[name] for name in self._CSV_COLUMNS)
+            except KeyError as e:
+                logger.error(f"CSV file {path} is missing column {e}")
+                return 0
+            rows = self._iter_csv_rows(reader, columns)
+            
+            # Pooled connections already run in WAL with synchronous=NORMAL;
+            # the whole load is one transaction, so there is a single commit
+            with self.db.transaction() as conn:
+                # Larger page cache for the bulk load, restored afterwards
+                # since the connection goes back to the pool
+                cache_size = conn.execute('PRAGMA cache_size').fetchone()[0]
+                conn.execute('PRAGMA cache_size=-65536')
                 cursor = conn.cursor()
                 
-                for row in reader:
-                    # Only store airports with ICAO codes
-                    ident = row.get('ident', '')
-                    if not ident or len(ident) != 4 or not ident.isalpha():
-                        continue
-                    
-                    # Map country code to name (simplified - could use a proper mapping)
-                    country_code = row.get('iso_country', '')
-                    
-                    cursor.execute('''
-                        INSERT OR REPLACE INTO aerodromes (
-                            icao_code, iata_code, name, type,
-                            latitude, longitude, elevation_ft,
-                            continent, country_code, country_name,
-                            region, municipality, gps_code, source,
-                            updated_at
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    ''', (
-                        ident,
-                        row.get('iata_code'),
-                        row.get('name'),
-                        row.get('type'),
-                        self._safe_float(row.get('latitude_deg')),
-                        self._safe_float(row.get('longitude_deg')),
-                        self._safe_int(row.get('elevation_ft')),
-                        row.get('continent'),
-                        country_code,
-                        self._country_code_to_name(country_code),
-                        row.get('iso_region'),
-                        row.get('municipality'),
-                        row.get('gps_code'),
-                        'ourairports',
-                        datetime.now().isoformat()
-                    ))
-                    
-                    count += 1
-                    
-                    if count % 1000 == 0:
-                        logger.info(f"Loaded {count} aerodromes...")
+                try:
+                    while True:
+                        batch = list(islice(rows, self.LOAD_BATCH_SIZE))
+                        if not batch:
+                            break
+                        cursor.executemany(self._UPSERT_AERODROME_SQL, batch)
+                        count += len(batch)
+                        if len(batch) == self.LOAD_BATCH_SIZE:
+                            logger.info(f"Loaded {count} aerodromes...")
+                finally:
+                    conn.execute(f'PRAGMA cache_size={cache_size}')
+                
+                # A full load changes the table's shape; refresh its stats
+                if count > self.ANALYZE_THRESHOLD:
+                    conn.execute('ANALYZE aerodromes')
         
+        if self._index is not None:
+            self.load_index()
+        else:
+            self._get_cached.cache_clear()
         logger.info(f"Loaded {count} aerodromes from {path}")
         return count
     
+    # OurAirports columns read during load, in _UPSERT_AERODROME_SQL order
+    _CSV_COLUMNS = (
+        'ident', 'iata_code', 'name', 'type',
+        'latitude_deg', 'longitude_deg', 'elevation_ft',
+        'continent', 'iso_country', 'iso_region', 'municipality', 'gps_code',
+    )
+    
+    def _iter_csv_rows(self, reader: Iterator[List[str]],
+                       columns: Tuple[int, ...]) -> Iterator[Tuple]:
+        """
+        Yield aerodrome parameter tuples from OurAirports CSV rows.
+        
+        Args:
+            reader: csv.reader positioned after the header row
+            columns: Positions of _CSV_COLUMNS within each row
+            
+        Returns:
+            Iterator of tuples matching _UPSERT_AERODROME_SQL
+        """
+        (col_ident, col_iata, col_name, col_type, col_lat, col_lon, col_elev,
+         col_continent, col_country, col_region, col_municipality,
+         col_gps) = columns
+        width = max(columns) + 1
+        
+        safe_float = self._safe_float
+        safe_int = self._safe_int
+        country_name = _COUNTRY_CODE_TO_NAME.get
+        is_icao = _ICAO_IDENT_MATCH
+        # All rows in a load share one timestamp
+        loaded_at = datetime.now().isoformat()
+        
+        for row in reader:
+            if len(row) < width:
+                continue
+            
+            # Only store airports with ICAO codes
+            ident = row[col_ident]
+            if not is_icao(ident):
+                continue
+            
+            country_code = row[col_country]
+            
+            yield (
+                ident,
+                row[col_iata],
+                row[col_name],
+                row[col_type],
+                safe_float(row[col_lat]),
+                safe_float(row[col_lon]),
+                safe_int(row[col_elev]),
+                row[col_continent],
+                country_code,
+                country_name(country_code, country_code),
+                row[col_region],
+                row[col_municipality],
+                row[col_gps],
+                'ourairports',
+                loaded_at
+            )
+    
     def infer_from_notam(self, notam: Notam) -> None:
         """
-        Store minimal record inferred from NOTAM data when no CSV data exists.
+        Queue a minimal record inferred from NOTAM data when no CSV data exists.
+        
+        Records are written behind in batches of INFER_FLUSH_SIZE; call
+        flush_inferences() to write any pending records immediately. Pending
+        records are also written at process exit.
         
         Args:
             notam: Notam instance containing airport info
@@ -171,27 +397,60 @@ class AerodromeRepository:
         if not icao_code:
             return
         
-        # Check if already exists
-        existing = self.get(icao_code)
-        if existing:
-            return
+        record = (
+            icao_code,
+            notam.airport_name or f"Airport {icao_code}",
+            'notam_inference',
+            datetime.now().isoformat()
+        )
         
-        with self.db.get_connection() as conn:
+        with self._buffer_lock:
+            self._infer_buffer.append(record)
+            if len(self._infer_buffer) < self.INFER_FLUSH_SIZE:
+                return
+            rows, self._infer_buffer = self._infer_buffer, []
+        
+        self._write_inferences(rows)
+    
+    def flush_inferences(self) -> int:
+        """
+        Write all pending inferred aerodromes to the database.
+        
+        Returns:
+            Number of aerodromes actually inserted
+        """
+        with self._buffer_lock:
+            rows, self._infer_buffer = self._infer_buffer, []
+        
+        return self._write_inferences(rows)
+    
+    def _write_inferences(self, rows: List[Tuple]) -> int:
+        """Insert inferred aerodrome records in one transaction."""
+        if not rows:
+            return 0
+        
+        # The primary key makes OR IGNORE a no-op for known aerodromes
+        with self.db.transaction() as conn:
             cursor = conn.cursor()
-            cursor.execute('''
+            cursor.executemany('''
                 INSERT OR IGNORE INTO aerodromes (
                     icao_code, name, source, updated_at
                 ) VALUES (?, ?, ?, ?)
-            ''', (
-                icao_code,
-                notam.airport_name or f"Airport {icao_code}",
-                'notam_inference',
-                datetime.now().isoformat()
-            ))
-            
-            logger.debug(f"Inferred aerodrome from NOTAM: {icao_code}")
+            ''', rows)
+            inserted = cursor.rowcount
+        
+        if inserted <= 0:
+            return 0
+        
+        logger.debug(f"Inferred {inserted} aerodrome(s) from NOTAMs")
+        self._get_cached.cache_clear()
+        if self._index is not None:
+            codes = list(dict.fromkeys(row[0] for row in rows))
+            self._index.update(self._select_many(codes))
+        
+        return inserted
     
-    def enrich_notam(self, notam: Notam) -> Dict[str, Any]:
+    def enrich_notam(self, notam: Notam) -> Optional[sqlite3.Row]:
         """
         Enrich NOTAM with aerodrome data.
         
@@ -199,10 +458,10 @@ class AerodromeRepository:
             notam: Notam instance
             
         Returns:
-            Aerodrome dict (empty if not found)
+            Aerodrome row, or None if not found
         """
         if not notam.airport_code:
-            return {}
+            return None
         
         aerodrome = self.get(notam.airport_code)
         if aerodrome:
@@ -210,7 +469,34 @@ class AerodromeRepository:
         
         # Try to infer and store for future
         self.infer_from_notam(notam)
-        return {}
+        self.flush_inferences()
+        return None
+    
+    def enrich_notams(self, notams: Iterable[Notam]) -> Dict[str, Optional[sqlite3.Row]]:
+        """
+        Enrich a batch of NOTAMs with aerodrome data using a single lookup.
+        
+        Airports not yet known are inferred from the NOTAM, as with
+        enrich_notam().
+        
+        Args:
+            notams: Notam instances
+            
+        Returns:
+            Dict mapping notam_id to aerodrome row, or None if not found
+        """
+        notams = list(notams)
+        aerodromes = self.get_many(n.airport_code for n in notams if n.airport_code)
+        
+        enriched = {}
+        for notam in notams:
+            aerodrome = aerodromes.get(notam.airport_code.upper()) if notam.airport_code else None
+            if aerodrome is None and notam.airport_code:
+                self.infer_from_notam(notam)
+            enriched[notam.notam_id] = aerodrome
+        
+        self.flush_inferences()
+        return enriched
     
     @staticmethod
     def download_csv(target_path: str) -> bool:
@@ -228,7 +514,9 @@ class AerodromeRepository:
             os.makedirs(os.path.dirname(target_path), exist_ok=True)
             
             logger.info(f"Downloading OurAirports CSV from {AerodromeRepository.OURAIRPORTS_URL}")
-            urllib.request.urlretrieve(AerodromeRepository.OURAIRPORTS_URL, target_path)
+            with urllib.request.urlopen(AerodromeRepository.OURAIRPORTS_URL, timeout=30) as response, \
+                    open(target_path, 'wb') as f:
+                shutil.copyfileobj(response, f, length=AerodromeRepository.DOWNLOAD_CHUNK_SIZE)
             logger.info(f"Downloaded to {target_path}")
             return True
         except Exception as e:
@@ -258,59 +546,4 @@ class AerodromeRepository:
     @staticmethod
     def _country_code_to_name(code: str) -> str:
         """Simple ISO country code to name mapping."""
-        # This is a minimal mapping - expand as needed
-        mapping = {
-            'US': 'United States',
-            'CA': 'Canada',
-            'GB': 'United Kingdom',
-            'FR': 'France',
-            'DE': 'Germany',
-            'JP': 'Japan',
-            'CN': 'China',
-            'AU': 'Australia',
-            'BR': 'Brazil',
-            'ZA': 'South Africa',
-            'AE': 'United Arab Emirates',
-            'SG': 'Singapore',
-            'DK': 'Denmark',
-            'NO': 'Norway',
-            'SE': 'Sweden',
-            'FI': 'Finland',
-            'PL': 'Poland',
-            'LT': 'Lithuania',
-            'EE': 'Estonia',
-            'LV': 'Latvia',
-            'HU': 'Hungary',
-            'CZ': 'Czech Republic',
-            'AT': 'Austria',
-            'GR': 'Greece',
-            'TR': 'Turkey',
-            'IL': 'Israel',
-            'OM': 'Oman',
-            'SA': 'Saudi Arabia',
-            'IR': 'Iran',
-            'IQ': 'Iraq',
-            'KE': 'Kenya',
-            'EG': 'Egypt',
-            'ET': 'Ethiopia',
-            'JO': 'Jordan',
-            'BH': 'Bahrain',
-            'QA': 'Qatar',
-            'BD': 'Bangladesh',
-            'NP': 'Nepal',
-            'TH': 'Thailand',
-            'VN': 'Vietnam',
-            'PH': 'Philippines',
-            'ID': 'Indonesia',
-            'MY': 'Malaysia',
-            'NZ': 'New Zealand',
-            'MX': 'Mexico',
-            'AR': 'Argentina',
-            'CO': 'Colombia',
-            'CL': 'Chile',
-            'PE': 'Peru',
-            'UY': 'Uruguay',
-            'PY': 'Paraguay',
-            'BO': 'Bolivia',
-        }
-        return mapping.get(code, code)
\ No newline at end of file
+        return _COUNTRY_CODE_TO_NAME.get(code, code)
@@ -1,11 +1,12 @@
 """Digest alert system for batching NOTAM notifications."""
+import heapq
 import time
 import logging
 import threading
-from collections import defaultdict
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 import requests
+from requests.adapters import HTTPAdapter
 
 from src.models.notam import Notam
 from src.config import Config
@@ -19,16 +20,30 @@ class AlertDigester:
     Prevents rate limiting by batching notifications.
     """
     
+    # Queued NOTAMs at which a digest is sent early rather than waiting
+    # for the interval, bounding memory between digests
+    MAX_PENDING = 1000
+    
     def __init__(self):
-        self.config = Config()
+        self.config = Config
         self.url = self.config.NTFY_URL
         self.interval = self.config.NTFY_DIGEST_INTERVAL
         self.min_score = self.config.NTFY_MIN_SCORE
         self.max_items = self.config.NTFY_MAX_DIGEST_ITEMS
         
+        # Keep-alive session so repeated POSTs to ntfy reuse one connection
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+        self._session.mount('https://', adapter)
+        self._session.mount('http://', adapter)
+        
         # Accumulators
         self.notams: List[Notam] = []
-        self.stats = defaultdict(int)  # Counts by type
+        # Counts by type
+        self.total = 0
+        self.closures = 0
+        self.drone = 0
+        self.restrictions = 0
         self.airports = set()  # Unique airports affected
         self.last_send = time.time()
         self.lock = threading.Lock()
@@ -55,13 +70,13 @@ class AlertDigester:
             self.notams.append(notam)
             
             # Update stats
-            self.stats['total'] += 1
+            self.total += 1
             if notam.is_closure:
-                self.stats['closures'] += 1
+                self.closures += 1
             if notam.is_drone_related:
-                self.stats['drone'] += 1
+                self.drone += 1
             if notam.is_restriction:
-                self.stats['restrictions'] += 1
+                self.restrictions += 1
             
             # Track unique airports
             if notam.airport_code:
@@ -95,18 +110,22 @@ class AlertDigester:
                 logger.debug("No NOTAMs to digest")
                 return False
             
-            # Take snapshot and clear
-            notams = self.notams.copy()
-            stats = dict(self.stats)
-            airports = list(self.airports)
-            
-            # Reset accumulators
-            self.notams.clear()
-            self.stats.clear()
-            self.airports.clear()
-        
-        # Sort by priority (highest first)
-        notams.sort(key=lambda n: n.priority_score, reverse=True)
+            # Swap in fresh accumulators; the old ones become the snapshot.
+            # Constant time, so add() is never blocked by a deep queue.
+            notams, self.notams = self.notams, []
+            airports, self.airports = self.airports, set()
+            stats = {
+                'total': self.total,
+                'closures': self.closures,
+                'drone': self.drone,
+                'restrictions': self.restrictions,
+            }
+            self.total = self.closures = self.drone = self.restrictions = 0
+        
+        # Select and format outside the lock. Only the top max_items are
+        # shown, so a bounded heap beats sorting the whole queue.
+        top = heapq.nlargest(self.max_items, notams, key=lambda n: n.priority_score)
+        overflow = len(notams) - len(top)
         
         # Build digest message
         title = f"NOTAM Digest: {stats.get('total', 0)} new high-priority items"
@@ -123,34 +142,16 @@ class AlertDigester:
             "",
         ]
         
-        if notams:
+        if top:
             body_parts.append("🔔 **Top Items**")
             
             # Show top N items
-            for i, notam in enumerate(notams[:self.max_items], 1):
-                airport = notam.airport_code or notam.location or "Unknown"
-                flags = []
-                if notam.is_closure:
-                    flags.append("CLOSURE")
-                if notam.is_drone_related:
-                    flags.append("DRONE")
-                if notam.is_restriction:
-                    flags.append("RESTRICTED")
-                
-                flag_str = f" [{', '.join(flags)}]" if flags else ""
-                
-                # Truncate body if needed
-                body_preview = notam.body.replace('\n', ' ').strip()
-                if len(body_preview) > 100:
-                    body_preview = body_preview[:100] + "..."
-                
-                body_parts.append(
-                    f"\n{i}. **{notam.notam_id}** - {airport} (Score: {notam.priority_score}){flag_str}\n"
-                    f"   {body_preview}"
-                )
+            body_parts.append("\n".join(
+                self._format_item(i, notam) for i, notam in enumerate(top, 1)
+            ))
             
-            if len(notams) > self.max_items:
-                body_parts.append(f"\n... and {len(notams) - self.max_items} more")
+            if overflow > 0:
+                body_parts.append(f"\n... and {overflow} more")
         
         body_parts.append(f"\n[View in NOTAM system]({self.url.replace('/send', '')})")
         
@@ -166,7 +167,7 @@ class AlertDigester:
         }
         
         try:
-            response = requests.post(
+            response = self._session.post(
                 self.url,
                 data=body.encode('utf-8'),
                 headers=headers,
@@ -184,6 +185,34 @@ class AlertDigester:
             # In production, you might want to store them for retry
             return False
     
+    @staticmethod
+    def _format_item(index: int, notam: Notam) -> str:
+        """Format one NOTAM as a numbered two-line digest entry."""
+        airport = notam.airport_code or notam.location or "Unknown"
+        flags = []
+        if notam.is_closure:
+            flags.append("CLOSURE")
+        if notam.is_drone_related:
+            flags.append("DRONE")
+        if notam.is_restriction:
+            flags.append("RESTRICTED")
+        
+        flag_str = f" [{', '.join(flags)}]" if flags else ""
+        
+        # Truncate body if needed
+        body_preview = (notam.body or '').replace('\n', ' ').strip()
+        if len(body_preview) > 100:
+            body_preview = body_preview[:100] + "..."
+        
+        return (
+            f"\n{index}. **{notam.notam_id}** - {airport} (Score: {notam.priority_score}){flag_str}\n"
+            f"   {body_preview}"
+        )
+    
+    def should_flush(self) -> bool:
+        """Check whether enough NOTAMs are queued to send a digest early."""
+        return len(self.notams) >= self.MAX_PENDING
+    
     def send_immediate(self) -> bool:
         """
         Force an immediate digest send (useful for shutdown).
@@ -1,5 +1,10 @@
 """Alerting module for ntfy integration."""
+import atexit
+import queue
+import threading
+import time
 import requests
+from requests.adapters import HTTPAdapter
 import logging
 from typing import Optional
 
@@ -8,6 +13,9 @@ from src.config import Config
 
 logger = logging.getLogger(__name__)
 
+# Queued after the pending alerts to stop the sender thread
+_STOP = object()
+
 
 class NtfyAlerter:
     """
@@ -15,10 +23,106 @@ class NtfyAlerter:
     Only fires when NTFY_URL is configured.
     """
     
+    # Alerts waiting for the background sender before enqueue() drops them
+    QUEUE_SIZE = 1024
+    
+    # Seconds flush() waits for queued alerts before dropping the rest
+    FLUSH_TIMEOUT = 30
+    
     def __init__(self):
-        self.config = Config()
+        self.config = Config
         self.url = self.config.NTFY_URL
         self.min_score = self.config.NTFY_MIN_SCORE
+        
+        # Keep-alive session so repeated POSTs to ntfy reuse one connection
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+        self._session.mount('https://', adapter)
+        self._session.mount('http://', adapter)
+        
+        # Alerts handed off by enqueue(), POSTed by a background thread
+        # that the first enqueue() starts
+        self._queue = queue.Queue(maxsize=self.QUEUE_SIZE)
+        self._sender: Optional[threading.Thread] = None
+        self._sender_lock = threading.Lock()
+    
+    def _start_sender_thread(self) -> None:
+        """Start background thread that sends queued alerts until _STOP."""
+        def send_loop():
+            while True:
+                notam = self._queue.get()
+                if notam is _STOP:
+                    return
+                try:
+                    self.send(notam)
+                except Exception as e:
+                    logger.error(f"Error sending alert: {e}")
+        
+        self._sender = threading.Thread(target=send_loop, daemon=True)
+        self._sender.start()
+        # Deliver whatever is still queued when the process exits
+        atexit.register(self.flush)
+    
+    def enqueue(self, notam: Notam) -> bool:
+        """
+        Queue an alert for the background sender without waiting on ntfy.
+        
+        Args:
+            notam: Notam instance
+            
+        Returns:
+            True if queued, False if alerts are disabled or the queue is full
+        """
+        if not self.url:
+            return False
+        
+        if self._sender is None:
+            with self._sender_lock:
+                if self._sender is None:
+                    self._start_sender_thread()
+        
+        try:
+            self._queue.put_nowait(notam)
+            return True
+        except queue.Full:
+            logger.warning(f"Alert queue full, dropping alert for {notam.notam_id}")
+            return False
+    
+    def flush(self) -> None:
+        """
+        Send every queued alert and stop the sender thread.
+        
+        Waits at most FLUSH_TIMEOUT seconds; alerts still queued after that
+        are logged and dropped. A later enqueue() starts a new sender.
+        """
+        with self._sender_lock:
+            sender = self._sender
+            if sender is None:
+                return
+            self._sender = None
+        atexit.unregister(self.flush)
+        
+        deadline = time.monotonic() + self.FLUSH_TIMEOUT
+        try:
+            self._queue.put(_STOP, timeout=self.FLUSH_TIMEOUT)
+        except queue.Full:
+            pass
+        sender.join(max(0.0, deadline - time.monotonic()))
+        if not sender.is_alive():
+            return
+        
+        dropped = 0
+        while True:
+            try:
+                dropped += self._queue.get_nowait() is not _STOP
+            except queue.Empty:
+                break
+        # Let the sender exit once its current alert is done
+        self._queue.put_nowait(_STOP)
+        logger.warning(
+            f"Alert flush timed out after {self.FLUSH_TIMEOUT}s, "
+            f"dropping {dropped} queued alert(s)"
+        )
     
     def should_alert(self, notam: Notam) -> bool:
         """
@@ -101,7 +205,7 @@ class NtfyAlerter:
         }
         
         try:
-            response = requests.post(
+            response = self._session.post(
                 self.url,
                 data=body.encode('utf-8'),  # Body can be UTF-8
                 headers=headers,
@@ -1,5 +1,6 @@
 """Configuration module for NOTAM system."""
 import os
+import re
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -7,7 +8,12 @@ load_dotenv()
 
 
 class Config:
-    """Application configuration."""
+    """
+    Application configuration.
+    
+    Settings are class attributes read from the environment once at import;
+    use the class itself (``Config.AIRPORTS``) rather than instances.
+    """
     
     # Logging level
     LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
@@ -34,9 +40,20 @@ class Config:
     # Request rate limiting (to appear natural)
     MIN_REQUEST_DELAY = float(os.getenv('MIN_REQUEST_DELAY', '2'))
     MAX_REQUEST_DELAY = float(os.getenv('MAX_REQUEST_DELAY', '5'))
+    # Airports / search terms fetched in parallel, each slot keeping the delays above
+    MAX_CONCURRENT_REQUESTS = int(os.getenv('MAX_CONCURRENT_REQUESTS', '1'))
+    
+    # Processes used to parse large batches (1 = no pool, 0 = one per CPU)
+    PARSE_WORKERS = int(os.getenv('PARSE_WORKERS', '1'))
     
     # Drone detection keywords
     DRONE_KEYWORDS = [k.strip().lower() for k in os.getenv('DRONE_KEYWORDS', 'drone,UAS,unmanned,RPAS').split(',') if k.strip()]
+    # Whole-word match of any drone keyword, compiled once (never matches if none
+    # configured); longest first so shared prefixes don't force backtracking
+    DRONE_PATTERN = re.compile(
+        r'\b(?:' + '|'.join(map(re.escape, sorted(set(DRONE_KEYWORDS), key=len, reverse=True))) + r')\b',
+        re.IGNORECASE
+    ) if DRONE_KEYWORDS else re.compile(r'(?!)')
     
     # Weight for drone-related closures - KEEP for backward compatibility
     DRONE_WEIGHT = 10
@@ -54,6 +71,8 @@ class Config:
     # Purge settings
     PURGE_EXPIRED_AFTER_DAYS = int(os.getenv('PURGE_EXPIRED_AFTER_DAYS', '30'))
     PURGE_CANCELLED_AFTER_DAYS = int(os.getenv('PURGE_CANCELLED_AFTER_DAYS', '7'))
+    # Minimum time between purge runs in continuous mode
+    PURGE_INTERVAL_SECONDS = int(os.getenv('PURGE_INTERVAL_SECONDS', '86400'))
     
     # Priority score thresholds
     CLOSURE_SCORE = int(os.getenv('CLOSURE_SCORE', '50'))
@@ -1,42 +1,435 @@
 """Database module for storing NOTAM data."""
+import queue
 import sqlite3
+import threading
+import time
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Tuple, Any
+from pathlib import Path
+from typing import List, Dict, Optional, Tuple, Any, Iterable, Iterator
 from contextlib import contextmanager
+from functools import lru_cache
 import logging
 
 from src.models.notam import Notam, NotamType
 
 logger = logging.getLogger(__name__)
 
+# Statements used on the NOTAM write path, defined once so every call
+# reuses the same SQL text (and sqlite3's per-connection statement cache)
+_CANCEL_NOTAM_SQL = '''
+    UPDATE notams 
+    SET notam_type = 'CANCEL',
+        updated_at = ?
+    WHERE notam_id = ?
+'''
+
+# Insert-or-update in one statement. update_count is only bumped by the
+# DO UPDATE branch, so RETURNING can tell a new row (count still 0) from
+# an updated one. RETURNING needs SQLite 3.35+.
+_UPSERT_NOTAM_SQL = '''
+    INSERT INTO notams (
+        notam_id, series, notam_type, replaces_notam_id,
+        cancels_notam_id, fir, q_code, q_code_subject,
+        q_code_condition, traffic, purpose, scope,
+        lower_limit, upper_limit, coordinates, latitude,
+        longitude, radius_nm, airport_code, airport_name,
+        location, valid_from, valid_to, is_permanent,
+        schedule, body, lower_limit_text, upper_limit_text,
+        is_closure, is_drone_related, is_restriction,
+        is_trigger_notam, search_term, priority_score,
+        source, source_type, issue_date, raw_icao_message,
+        transaction_id, has_history, updated_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(notam_id) DO UPDATE SET
+        series = excluded.series,
+        notam_type = excluded.notam_type,
+        replaces_notam_id = excluded.replaces_notam_id,
+        cancels_notam_id = excluded.cancels_notam_id,
+        fir = excluded.fir,
+        q_code = excluded.q_code,
+        q_code_subject = excluded.q_code_subject,
+        q_code_condition = excluded.q_code_condition,
+        traffic = excluded.traffic,
+        purpose = excluded.purpose,
+        scope = excluded.scope,
+        lower_limit = excluded.lower_limit,
+        upper_limit = excluded.upper_limit,
+        coordinates = excluded.coordinates,
+        latitude = excluded.latitude,
+        longitude = excluded.longitude,
+        radius_nm = excluded.radius_nm,
+        airport_code = excluded.airport_code,
+        airport_name = excluded.airport_name,
+        location = excluded.location,
+        valid_from = excluded.valid_from,
+        valid_to = excluded.valid_to,
+        is_permanent = excluded.is_permanent,
+        schedule = excluded.schedule,
+        body = excluded.body,
+        lower_limit_text = excluded.lower_limit_text,
+        upper_limit_text = excluded.upper_limit_text,
+        is_closure = excluded.is_closure,
+        is_drone_related = excluded.is_drone_related,
+        is_restriction = excluded.is_restriction,
+        is_trigger_notam = excluded.is_trigger_notam,
+        search_term = excluded.search_term,
+        priority_score = excluded.priority_score,
+        source = excluded.source,
+        source_type = excluded.source_type,
+        issue_date = excluded.issue_date,
+        raw_icao_message = excluded.raw_icao_message,
+        transaction_id = excluded.transaction_id,
+        has_history = excluded.has_history,
+        updated_at = excluded.updated_at,
+        update_count = update_count + 1
+    RETURNING id, update_count = 0
+'''
+
+_INSERT_SEARCH_RUN_SQL = '''
+    INSERT INTO search_runs
+    (search_term, airport_codes, mode, total_fetched, new_inserted, updated)
+    VALUES (?, ?, ?, ?, ?, ?)
+'''
+
+_INSERT_SEARCH_RUN_AIRPORT_SQL = '''
+    INSERT OR IGNORE INTO search_run_airports (run_id, airport_code)
+    VALUES (?, ?)
+'''
+
+# Columns returned by the NOTAM listing queries, in table order
+_NOTAM_COLUMNS = (
+    'id', 'notam_id', 'series', 'notam_type', 'replaces_notam_id',
+    'cancels_notam_id', 'fir', 'q_code', 'q_code_subject', 'q_code_condition',
+    'traffic', 'purpose', 'scope', 'lower_limit', 'upper_limit', 'coordinates',
+    'latitude', 'longitude', 'radius_nm', 'airport_code', 'airport_name',
+    'location', 'valid_from', 'valid_to', 'is_permanent', 'schedule', 'body',
+    'lower_limit_text', 'upper_limit_text', 'is_closure', 'is_drone_related',
+    'is_restriction', 'is_trigger_notam', 'search_term', 'priority_score',
+    'source', 'source_type', 'issue_date', 'raw_icao_message',
+    'transaction_id', 'has_history', 'created_at', 'updated_at',
+)
+
+# Lean projection for listings and reports: skips the heavy text columns
+# (body, raw_icao_message, ...) that summary views never display
+SUMMARY_COLUMNS = (
+    'notam_id', 'notam_type', 'airport_code', 'location', 'valid_from',
+    'valid_to', 'priority_score', 'is_closure', 'is_drone_related',
+    'is_restriction', 'search_term',
+)
+
+_SELECT_NOTAMS_SQL = f"SELECT {', '.join(_NOTAM_COLUMNS)} FROM notams"
+
+
+@lru_cache(maxsize=32)
+def _select_notams_sql(columns: Tuple[str, ...]) -> str:
+    """
+    Build the SELECT prefix for a column projection.
+    
+    Column names are checked against _NOTAM_COLUMNS before being spliced
+    into SQL, so callers can never inject arbitrary expressions.
+    
+    Args:
+        columns: Column names to select, in output order
+        
+    Returns:
+        SELECT ... FROM notams clause
+    """
+    if columns == _NOTAM_COLUMNS:
+        return _SELECT_NOTAMS_SQL
+    unknown = [c for c in columns if c not in _NOTAM_COLUMNS]
+    if unknown or not columns:
+        raise ValueError(f"Unknown NOTAM columns: {unknown or columns}")
+    return f"SELECT {', '.join(columns)} FROM notams"
+
+# Shared clauses for the NOTAM listing queries. Keeping them as constants
+# means each listing always produces the same SQL text, so repeat calls hit
+# the connection's statement cache instead of being re-prepared. The current
+# epoch is bound from Python rather than computed by SQLite per statement.
+_ACTIVE_FILTER_SQL = '''
+    AND (valid_to_ts IS NULL OR valid_to_ts > ?)
+    AND (notam_type != 'CANCEL' OR notam_type IS NULL)
+'''
+
+_PRIORITY_ORDER_SQL = ' ORDER BY priority_score DESC, valid_from_ts DESC'
+
+# Complete WHERE/ORDER BY tails for each listing, one per active_only
+# branch, assembled once at import rather than concatenated per call
+_ACTIVE_NOTAMS_SQL = (
+    ' WHERE priority_score >= ?' + _ACTIVE_FILTER_SQL + _PRIORITY_ORDER_SQL
+)
+_CLOSURES_ALL_SQL = ' WHERE is_closure = 1' + _PRIORITY_ORDER_SQL
+_CLOSURES_ACTIVE_SQL = ' WHERE is_closure = 1' + _ACTIVE_FILTER_SQL + _PRIORITY_ORDER_SQL
+_DRONE_ALL_SQL = ' WHERE is_drone_related = 1' + _PRIORITY_ORDER_SQL
+_DRONE_ACTIVE_SQL = ' WHERE is_drone_related = 1' + _ACTIVE_FILTER_SQL + _PRIORITY_ORDER_SQL
+_BY_SEARCH_TERM_ALL_SQL = ' WHERE search_term = ?' + _PRIORITY_ORDER_SQL
+_BY_SEARCH_TERM_ACTIVE_SQL = ' WHERE search_term = ?' + _ACTIVE_FILTER_SQL + _PRIORITY_ORDER_SQL
+_BY_AIRPORT_ALL_SQL = ' WHERE airport_code = ?' + _PRIORITY_ORDER_SQL
+_BY_AIRPORT_ACTIVE_SQL = ' WHERE airport_code = ?' + _ACTIVE_FILTER_SQL + _PRIORITY_ORDER_SQL
+_SEARCH_BODY_WHERE_SQL = ' WHERE id IN (SELECT rowid FROM notams_fts WHERE notams_fts MATCH ?)'
+_SEARCH_BODY_ALL_SQL = _SEARCH_BODY_WHERE_SQL + _PRIORITY_ORDER_SQL
+_SEARCH_BODY_ACTIVE_SQL = _SEARCH_BODY_WHERE_SQL + _ACTIVE_FILTER_SQL + _PRIORITY_ORDER_SQL
+
+# Bounded purge statements: each run deletes at most one chunk (the
+# trailing LIMIT parameter), so the purge methods loop until a short chunk
+_PURGE_EXPIRED_SQL = '''
+    DELETE FROM notams WHERE rowid IN (
+        SELECT rowid FROM notams WHERE valid_to_ts < ? LIMIT ?
+    )
+'''
+
+_PURGE_CANCELLED_SQL = '''
+    DELETE FROM notams WHERE rowid IN (
+        SELECT rowid FROM notams
+        WHERE notam_type = 'CANCEL' AND updated_at < ?
+        LIMIT ?
+    )
+'''
+
+_PURGE_SEARCH_RUNS_SQL = '''
+    DELETE FROM search_runs WHERE rowid IN (
+        SELECT rowid FROM search_runs WHERE run_at < ? LIMIT ?
+    )
+'''
+
+# All summary counters in a single scan; binds the current epoch. SUM() is NULL on an empty table,
+# hence the COALESCEs.
+_STATISTICS_SQL = '''
+    WITH flags AS (
+        SELECT
+            is_closure = 1 AS closure,
+            is_drone_related = 1 AS drone,
+            priority_score >= 80 AS high_priority,
+            (valid_to_ts IS NULL OR valid_to_ts > ?)
+                AND (notam_type != 'CANCEL' OR notam_type IS NULL) AS active
+        FROM notams
+    )
+    SELECT
+        COUNT(*),
+        COALESCE(SUM(active), 0),
+        COALESCE(SUM(closure), 0),
+        COALESCE(SUM(closure AND active), 0),
+        COALESCE(SUM(drone), 0),
+        COALESCE(SUM(drone AND active), 0),
+        COALESCE(SUM(high_priority), 0)
+    FROM flags
+'''
+
 
 class NotamDatabase:
     """Handles all database operations for NOTAM data."""
     
+    # Per-connection tuning; journal_mode=WAL is persistent and set once
+    # in _init_database
+    CONNECTION_PRAGMAS = (
+        'PRAGMA synchronous=NORMAL',
+        'PRAGMA temp_store=MEMORY',
+        'PRAGMA mmap_size=268435456',
+        'PRAGMA cache_size=-64000',
+        'PRAGMA foreign_keys=ON',
+        # Wait for a competing writer instead of failing with "database is locked"
+        'PRAGMA busy_timeout=5000',
+        # Sample at most ~1000 rows per index in ANALYZE / PRAGMA optimize
+        'PRAGMA analysis_limit=1000',
+    )
+    
+    # Idle reader connections kept open for reuse between calls
+    POOL_SIZE = 8
+    
+    # Compiled statements cached per connection (sqlite3 default is 128)
+    STATEMENT_CACHE_SIZE = 256
+    
+    # Rows fetched per block when streaming NOTAM listings
+    FETCH_SIZE = 500
+    
+    # Rows deleted per committed transaction by the purge methods
+    PURGE_CHUNK_SIZE = 5000
+    
+    # Upsert batches at least this large refresh the notams statistics
+    ANALYZE_BATCH_SIZE = 100
+    
     def __init__(self, db_path: str):
         """Initialize database connection."""
+        if sqlite3.sqlite_version_info < (3, 35):
+            raise RuntimeError(
+                f"SQLite 3.35 or newer is required (found {sqlite3.sqlite_version})"
+            )
         self.db_path = db_path
+        # Single long-lived writer, shared by threads under a lock
+        self._write_conn: Optional[sqlite3.Connection] = None
+        self._write_lock = threading.Lock()
+        # Idle reader connections
+        self._pool: queue.Queue = queue.Queue(maxsize=self.POOL_SIZE)
+        # Writer connection held by the current thread, if any
+        self._local = threading.local()
+        # Lazily opened read-only handle for ad-hoc queries
+        self._ro_conn: Optional[sqlite3.Connection] = None
+        self._ro_lock = threading.Lock()
         self._init_database()
     
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Open a new tuned connection to the database.
+        
+        Connections run in autocommit mode: sqlite3 never opens a
+        transaction behind our back, so reads run outside any transaction
+        and writes that need one use transaction().
+        """
+        conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            isolation_level=None,
+            cached_statements=self.STATEMENT_CACHE_SIZE
+        )
+        conn.row_factory = sqlite3.Row
+        for pragma in self.CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+    
     @contextmanager
     def get_connection(self):
-        """Context manager for database connections."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        """
+        Context manager for the writer connection.
+        
+        The writer is opened once and handed to one thread at a time.
+        Nested calls on the same thread, including those inside a
+        transaction() block, reuse it and leave the commit to the
+        outermost block. Outside a transaction() each statement commits
+        on its own.
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            yield conn
+            return
+        
+        with self._write_lock:
+            if self._write_conn is None:
+                self._write_conn = self._connect()
+            conn = self._write_conn
+            self._local.conn = conn
+            try:
+                yield conn
+                # Only an explicit BEGIN leaves a transaction open
+                if conn.in_transaction:
+                    conn.commit()
+            except Exception:
+                if conn.in_transaction:
+                    conn.rollback()
+                raise
+            finally:
+                self._local.conn = None
+    
+    def _acquire(self) -> sqlite3.Connection:
+        """Take an idle reader from the pool, opening one if none is free."""
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+            conn.execute('PRAGMA query_only=ON')
+            return conn
+    
+    def _release(self, conn: sqlite3.Connection) -> None:
+        """Return a reader to the pool, closing it if the pool is full."""
+        try:
+            self._pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+    
+    def _read(self, sql: str, params: tuple = ()) -> List[tuple]:
+        """
+        Run a read-only query and return its rows as plain tuples.
+        
+        Uses a pooled reader, so under WAL it never waits on the writer,
+        and never touches the write lock. Inside a write
+        block the writer is used so uncommitted rows stay visible.
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            cursor = conn.cursor()
+            cursor.row_factory = None
+            return cursor.execute(sql, params).fetchall()
+        
+        conn = self._acquire()
         try:
+            cursor = conn.cursor()
+            cursor.row_factory = None
+            return cursor.execute(sql, params).fetchall()
+        finally:
+            self._release(conn)
+    
+    @contextmanager
+    def transaction(self):
+        """
+        Group several writes into a single IMMEDIATE transaction.
+        
+        Every method called on this thread inside the block shares the
+        writer connection, so a batch of upserts costs one commit instead
+        of one per row. Rolled back as a whole if the block raises.
+        """
+        if getattr(self._local, 'conn', None) is not None:
+            yield self._local.conn
+            return
+        
+        with self.get_connection() as conn:
+            conn.execute('BEGIN IMMEDIATE')
             yield conn
-            conn.commit()
+    
+    def _read_only(self) -> sqlite3.Connection:
+        """Return the read-only connection, opening it on first use."""
+        if self._ro_conn is None:
+            uri = Path(self.db_path).resolve().as_uri() + '?mode=ro'
+            conn = sqlite3.connect(
+                uri, uri=True, check_same_thread=False, isolation_level=None
+            )
+            conn.row_factory = sqlite3.Row
+            for pragma in self.CONNECTION_PRAGMAS:
+                conn.execute(pragma)
+            self._ro_conn = conn
+        return self._ro_conn
+    
+    def optimize(self) -> None:
+        """
+        Let SQLite refresh planner statistics that have gone stale.
+        
+        PRAGMA optimize only re-analyzes tables whose statistics it judges
+        out of date, so it is cheap enough to run every cycle.
+        """
+        with self.get_connection() as conn:
+            conn.execute('PRAGMA optimize')
+    
+    def close(self) -> None:
+        """Close the writer, every pooled reader and the read-only handle."""
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
+        with self._write_lock:
+            if self._write_conn is not None:
+                # SQLite's recommended idiom: optimize as the connection closes
+                try:
+                    self._write_conn.execute('PRAGMA optimize')
+                finally:
+                    self._write_conn.close()
+                    self._write_conn = None
+        with self._ro_lock:
+            if self._ro_conn is not None:
+                self._ro_conn.close()
+                self._ro_conn = None
+    
+    def __del__(self):
+        try:
+            self.close()
         except Exception:
-            conn.rollback()
-            raise
-        finally:
-            conn.close()
+            pass
     
     def _init_database(self):
         """Create database tables if they don't exist."""
         with self.get_connection() as conn:
             cursor = conn.cursor()
             
+            # WAL lets readers run alongside the writer and persists in the file
+            cursor.execute('PRAGMA journal_mode=WAL')
+            
             # notams table
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS notams (
@@ -82,38 +475,84 @@ class NotamDatabase:
                     transaction_id      INTEGER,
                     has_history         BOOLEAN DEFAULT 0,
                     created_at          DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    updated_at          DATETIME DEFAULT CURRENT_TIMESTAMP
+                    updated_at          DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    update_count        INTEGER NOT NULL DEFAULT 0,
+                    valid_to_ts         INTEGER GENERATED ALWAYS AS (
+                                            CAST(strftime('%s', valid_to) AS INTEGER)
+                                        ) VIRTUAL,
+                    valid_from_ts       INTEGER GENERATED ALWAYS AS (
+                                            CAST(strftime('%s', valid_from) AS INTEGER)
+                                        ) VIRTUAL
                 )
             ''')
             
+            # Databases created before update_count / valid_*_ts existed
+            columns = {row['name'] for row in cursor.execute('PRAGMA table_xinfo(notams)')}
+            if 'update_count' not in columns:
+                cursor.execute(
+                    'ALTER TABLE notams ADD COLUMN update_count INTEGER NOT NULL DEFAULT 0'
+                )
+            if 'valid_to_ts' not in columns:
+                cursor.execute('''
+                    ALTER TABLE notams ADD COLUMN valid_to_ts INTEGER
+                    GENERATED ALWAYS AS (CAST(strftime('%s', valid_to) AS INTEGER)) VIRTUAL
+                ''')
+            if 'valid_from_ts' not in columns:
+                cursor.execute('''
+                    ALTER TABLE notams ADD COLUMN valid_from_ts INTEGER
+                    GENERATED ALWAYS AS (CAST(strftime('%s', valid_from) AS INTEGER)) VIRTUAL
+                ''')
+            
             # Indexes for performance
-            cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_notams_airport_code 
-                ON notams(airport_code)
-            ''')
             cursor.execute('''
                 CREATE INDEX IF NOT EXISTS idx_notams_valid_dates 
                 ON notams(valid_from, valid_to)
             ''')
+            # Activity checks compare epoch integers instead of ISO strings
             cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_notams_closure 
-                ON notams(is_closure)
+                CREATE INDEX IF NOT EXISTS idx_notams_valid_to_ts 
+                ON notams(valid_to_ts)
             ''')
             cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_notams_drone 
-                ON notams(is_drone_related)
+                CREATE INDEX IF NOT EXISTS idx_notams_type 
+                ON notams(notam_type)
             ''')
+            
+            # Listing lookups use indexes that end in the listing order
+            # (priority_score DESC, valid_from_ts DESC), so no temp B-tree
+            # sort is needed; the epoch key keeps index entries smaller than
+            # the ISO text. Closure and drone listings use partial indexes
+            # that only hold the flagged rows. These supersede older indexes.
+            for index_name in (
+                'idx_notams_airport_code', 'idx_notams_search_term',
+                'idx_notams_closure', 'idx_notams_drone', 'idx_notams_priority',
+                'idx_notams_closure_priority', 'idx_notams_drone_priority',
+                'idx_notams_priority_valid', 'idx_notams_closure_active',
+                'idx_notams_drone_active', 'idx_notams_airport_priority',
+                'idx_notams_search_term_priority',
+            ):
+                cursor.execute(f'DROP INDEX IF EXISTS {index_name}')
             cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_notams_priority 
-                ON notams(priority_score DESC)
+                CREATE INDEX IF NOT EXISTS idx_notams_priority_valid_ts
+                ON notams(priority_score DESC, valid_from_ts DESC)
             ''')
             cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_notams_search_term 
-                ON notams(search_term)
+                CREATE INDEX IF NOT EXISTS idx_notams_closure_active_ts
+                ON notams(priority_score DESC, valid_from_ts DESC)
+                WHERE is_closure = 1
             ''')
             cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_notams_type 
-                ON notams(notam_type)
+                CREATE INDEX IF NOT EXISTS idx_notams_drone_active_ts
+                ON notams(priority_score DESC, valid_from_ts DESC)
+                WHERE is_drone_related = 1
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_notams_airport_priority_ts
+                ON notams(airport_code, priority_score DESC, valid_from_ts DESC)
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_notams_search_term_priority_ts
+                ON notams(search_term, priority_score DESC, valid_from_ts DESC)
             ''')
             
             # search_runs table - lightweight audit log
@@ -130,6 +569,78 @@ class NotamDatabase:
                 )
             ''')
             
+            # One row per airport searched, so audit queries on an airport
+            # use an index instead of LIKE over search_runs.airport_codes.
+            # Rows go with their run when old runs are purged.
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'search_run_airports'")
+            backfill = cursor.fetchone() is None
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS search_run_airports (
+                    run_id          INTEGER NOT NULL
+                                    REFERENCES search_runs(id) ON DELETE CASCADE,
+                    airport_code    TEXT NOT NULL,
+                    PRIMARY KEY (run_id, airport_code)
+                ) WITHOUT ROWID
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_search_run_airports_code
+                ON search_run_airports(airport_code)
+            ''')
+            if backfill:
+                cursor.execute('''
+                    SELECT id, airport_codes FROM search_runs
+                    WHERE airport_codes IS NOT NULL
+                ''')
+                cursor.executemany(_INSERT_SEARCH_RUN_AIRPORT_SQL, [
+                    (run_id, code)
+                    for run_id, codes in cursor.fetchall()
+                    for code in codes.split(',') if code
+                ])
+            
+            # Full-text index over NOTAM bodies. It is an external-content
+            # table (the text lives only in notams), kept in sync by triggers;
+            # updates that leave the body unchanged skip the index entirely.
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'notams_fts'")
+            rebuild_fts = cursor.fetchone() is None
+            cursor.execute('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS notams_fts USING fts5(
+                    notam_id UNINDEXED, body,
+                    content='notams', content_rowid='id'
+                )
+            ''')
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS notams_fts_insert AFTER INSERT ON notams
+                BEGIN
+                    INSERT INTO notams_fts (rowid, notam_id, body)
+                    VALUES (new.id, new.notam_id, new.body);
+                END
+            ''')
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS notams_fts_delete AFTER DELETE ON notams
+                BEGIN
+                    INSERT INTO notams_fts (notams_fts, rowid, notam_id, body)
+                    VALUES ('delete', old.id, old.notam_id, old.body);
+                END
+            ''')
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS notams_fts_update AFTER UPDATE OF notam_id, body ON notams
+                WHEN old.body IS NOT new.body OR old.notam_id IS NOT new.notam_id
+                BEGIN
+                    INSERT INTO notams_fts (notams_fts, rowid, notam_id, body)
+                    VALUES ('delete', old.id, old.notam_id, old.body);
+                    INSERT INTO notams_fts (rowid, notam_id, body)
+                    VALUES (new.id, new.notam_id, new.body);
+                END
+            ''')
+            if rebuild_fts:
+                cursor.execute("INSERT INTO notams_fts (notams_fts) VALUES ('rebuild')")
+            
+            # Gather planner statistics once so the composite indexes are
+            # used; afterwards PRAGMA optimize keeps them current cheaply
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'")
+            if cursor.fetchone() is None:
+                cursor.execute('ANALYZE')
+            
             logger.info(f"Database initialized at {self.db_path}")
     
     def upsert_notam(self, notam: Notam) -> Tuple[Optional[int], bool]:
@@ -143,184 +654,64 @@ class NotamDatabase:
             Tuple of (row_id, was_inserted) where was_inserted is True for new records,
             False for updates
         """
-        with self.get_connection() as conn:
+        with self.transaction() as conn:
+            # Local wall-clock time, same format as before minus microseconds
+            now = time.strftime('%Y-%m-%dT%H:%M:%S')
+            return self._upsert(conn.cursor(), notam, now)
+    
+    def upsert_notams(self, notams: Iterable[Notam]) -> List[Tuple[int, bool]]:
+        """
+        Insert or update a batch of NOTAM records in one transaction.
+        
+        Args:
+            notams: Notam instances
+            
+        Returns:
+            List of (row_id, was_inserted) tuples in input order
+        """
+        with self.transaction() as conn:
             cursor = conn.cursor()
+            # One timestamp for the whole batch; it is written in one commit
+            now = time.strftime('%Y-%m-%dT%H:%M:%S')
+            results = [self._upsert(cursor, notam, now) for notam in notams]
+        
+        # A large ingest can shift the data enough to change index choice
+        if len(results) >= self.ANALYZE_BATCH_SIZE:
+            with self.get_connection() as conn:
+                conn.execute('ANALYZE notams')
+        
+        return results
+    
+    def _upsert(self, cursor: sqlite3.Cursor, notam: Notam, now: str) -> Tuple[int, bool]:
+        """
+        Write one NOTAM with the shared upsert statement.
+        
+        Args:
+            cursor: Cursor on the writer connection
+            notam: Notam instance
+            now: Timestamp stored as updated_at
             
-            # Check if exists
-            cursor.execute(
-                'SELECT id, notam_type FROM notams WHERE notam_id = ?',
-                (notam.notam_id,)
-            )
-            existing = cursor.fetchone()
-            
-            # Convert to dict for storage
-            data = notam.to_dict()
-            
-            # Handle NOTAMC (cancel) specially
-            if notam.notam_type == NotamType.CANCEL and existing:
-                # This NOTAM cancels another - we'll update both
-                if notam.cancels_notam_id:
-                    cursor.execute('''
-                        UPDATE notams 
-                        SET notam_type = 'CANCEL',
-                            updated_at = ?
-                        WHERE notam_id = ?
-                    ''', (datetime.now().isoformat(), notam.cancels_notam_id))
-                    logger.info(f"Marked {notam.cancels_notam_id} as cancelled")
-            
-            if existing:
-                # Update existing record
-                cursor.execute('''
-                    UPDATE notams SET
-                        series = ?,
-                        notam_type = ?,
-                        replaces_notam_id = ?,
-                        cancels_notam_id = ?,
-                        fir = ?,
-                        q_code = ?,
-                        q_code_subject = ?,
-                        q_code_condition = ?,
-                        traffic = ?,
-                        purpose = ?,
-                        scope = ?,
-                        lower_limit = ?,
-                        upper_limit = ?,
-                        coordinates = ?,
-                        latitude = ?,
-                        longitude = ?,
-                        radius_nm = ?,
-                        airport_code = ?,
-                        airport_name = ?,
-                        location = ?,
-                        valid_from = ?,
-                        valid_to = ?,
-                        is_permanent = ?,
-                        schedule = ?,
-                        body = ?,
-                        lower_limit_text = ?,
-                        upper_limit_text = ?,
-                        is_closure = ?,
-                        is_drone_related = ?,
-                        is_restriction = ?,
-                        is_trigger_notam = ?,
-                        search_term = ?,
-                        priority_score = ?,
-                        source = ?,
-                        source_type = ?,
-                        issue_date = ?,
-                        raw_icao_message = ?,
-                        transaction_id = ?,
-                        has_history = ?,
-                        updated_at = ?
-                    WHERE notam_id = ?
-                ''', (
-                    data.get('series'),
-                    data.get('notam_type'),
-                    data.get('replaces_notam_id'),
-                    data.get('cancels_notam_id'),
-                    data.get('fir'),
-                    data.get('q_code'),
-                    data.get('q_code_subject'),
-                    data.get('q_code_condition'),
-                    data.get('traffic'),
-                    data.get('purpose'),
-                    data.get('scope'),
-                    data.get('lower_limit'),
-                    data.get('upper_limit'),
-                    data.get('coordinates'),
-                    data.get('latitude'),
-                    data.get('longitude'),
-                    data.get('radius_nm'),
-                    data.get('airport_code'),
-                    data.get('airport_name'),
-                    data.get('location'),
-                    data.get('valid_from'),
-                    data.get('valid_to'),
-                    1 if data.get('is_permanent') else 0,
-                    data.get('schedule'),
-                    data.get('body'),
-                    data.get('lower_limit_text'),
-                    data.get('upper_limit_text'),
-                    1 if data.get('is_closure') else 0,
-                    1 if data.get('is_drone_related') else 0,
-                    1 if data.get('is_restriction') else 0,
-                    1 if data.get('is_trigger_notam') else 0,
-                    data.get('search_term'),
-                    data.get('priority_score', 0),
-                    data.get('source'),
-                    data.get('source_type'),
-                    data.get('issue_date'),
-                    data.get('raw_icao_message'),
-                    data.get('transaction_id'),
-                    1 if data.get('has_history') else 0,
-                    datetime.now().isoformat(),
-                    notam.notam_id
-                ))
-                
-                logger.debug(f"Updated NOTAM {notam.notam_id}")
-                return existing['id'], False
-            else:
-                # Insert new record
-                cursor.execute('''
-                    INSERT INTO notams (
-                        notam_id, series, notam_type, replaces_notam_id,
-                        cancels_notam_id, fir, q_code, q_code_subject,
-                        q_code_condition, traffic, purpose, scope,
-                        lower_limit, upper_limit, coordinates, latitude,
-                        longitude, radius_nm, airport_code, airport_name,
-                        location, valid_from, valid_to, is_permanent,
-                        schedule, body, lower_limit_text, upper_limit_text,
-                        is_closure, is_drone_related, is_restriction,
-                        is_trigger_notam, search_term, priority_score,
-                        source, source_type, issue_date, raw_icao_message,
-                        transaction_id, has_history, updated_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    notam.notam_id,
-                    data.get('series'),
-                    data.get('notam_type'),
-                    data.get('replaces_notam_id'),
-                    data.get('cancels_notam_id'),
-                    data.get('fir'),
-                    data.get('q_code'),
-                    data.get('q_code_subject'),
-                    data.get('q_code_condition'),
-                    data.get('traffic'),
-                    data.get('purpose'),
-                    data.get('scope'),
-                    data.get('lower_limit'),
-                    data.get('upper_limit'),
-                    data.get('coordinates'),
-                    data.get('latitude'),
-                    data.get('longitude'),
-                    data.get('radius_nm'),
-                    data.get('airport_code'),
-                    data.get('airport_name'),
-                    data.get('location'),
-                    data.get('valid_from'),
-                    data.get('valid_to'),
-                    1 if data.get('is_permanent') else 0,
-                    data.get('schedule'),
-                    data.get('body'),
-                    data.get('lower_limit_text'),
-                    data.get('upper_limit_text'),
-                    1 if data.get('is_closure') else 0,
-                    1 if data.get('is_drone_related') else 0,
-                    1 if data.get('is_restriction') else 0,
-                    1 if data.get('is_trigger_notam') else 0,
-                    data.get('search_term'),
-                    data.get('priority_score', 0),
-                    data.get('source'),
-                    data.get('source_type'),
-                    data.get('issue_date'),
-                    data.get('raw_icao_message'),
-                    data.get('transaction_id'),
-                    1 if data.get('has_history') else 0,
-                    datetime.now().isoformat()
-                ))
-                
-                logger.info(f"Inserted NOTAM {notam.notam_id} (score: {notam.priority_score})")
-                return cursor.lastrowid, True
+        Returns:
+            Tuple of (row_id, was_inserted)
+        """
+        # Insert, or update in place if the NOTAM is already stored
+        row_id, was_inserted = cursor.execute(
+            _UPSERT_NOTAM_SQL, notam.to_row() + (now,)
+        ).fetchone()
+        
+        if was_inserted:
+            logger.info(f"Inserted NOTAM {notam.notam_id} (score: {notam.priority_score})")
+            return row_id, True
+        
+        # Handle NOTAMC (cancel) specially: this NOTAM cancels another, so
+        # mark the target too. Checked in Python first, so ordinary NOTAMs
+        # never issue a second statement; the UPDATE itself is idempotent.
+        if notam.cancels_notam_id and notam.notam_type == NotamType.CANCEL:
+            cursor.execute(_CANCEL_NOTAM_SQL, (now, notam.cancels_notam_id))
+            logger.info(f"Marked {notam.cancels_notam_id} as cancelled")
+        
+        logger.debug(f"Updated NOTAM {notam.notam_id}")
+        return row_id, False
     
     def log_search_run(self, mode: str, search_term: Optional[str] = None,
                        airport_codes: Optional[List[str]] = None,
@@ -341,16 +732,12 @@ class NotamDatabase:
         Returns:
             ID of the log entry
         """
-        with self.get_connection() as conn:
+        with self.transaction() as conn:
             cursor = conn.cursor()
             
             airport_str = ','.join(airport_codes) if airport_codes else None
             
-            cursor.execute('''
-                INSERT INTO search_runs
-                (search_term, airport_codes, mode, total_fetched, new_inserted, updated)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (
+            cursor.execute(_INSERT_SEARCH_RUN_SQL, (
                 search_term,
                 airport_str,
                 mode,
@@ -358,143 +745,271 @@ class NotamDatabase:
                 new_inserted,
                 updated
             ))
+            run_id = cursor.lastrowid
+            
+            if airport_codes:
+                cursor.executemany(
+                    _INSERT_SEARCH_RUN_AIRPORT_SQL,
+                    [(run_id, code) for code in airport_codes]
+                )
             
-            return cursor.lastrowid
+            return run_id
     
-    def get_active_notams(self, min_score: int = 0) -> List[Dict]:
+    def _iter_notams(self, where: str, params: tuple = (),
+                     columns: Optional[Iterable[str]] = None) -> Iterator[Dict]:
+        """
+        Run a NOTAM listing query and yield rows as dictionaries.
+        
+        Rows are fetched in blocks of FETCH_SIZE plain tuples and zipped
+        against the projected column names, so only one block is held in
+        memory at a time. A pooled reader is held until the iterator is
+        exhausted or closed.
+        
+        Args:
+            where: WHERE/ORDER BY clauses appended to the SELECT
+            params: Query parameters
+            columns: Columns to select (default: all of _NOTAM_COLUMNS)
+        """
+        columns = tuple(columns) if columns is not None else _NOTAM_COLUMNS
+        query = _select_notams_sql(columns) + where
+        
+        conn = getattr(self._local, 'conn', None)
+        pooled = conn is None
+        if pooled:
+            conn = self._acquire()
+        try:
+            cursor = conn.cursor()
+            cursor.row_factory = None
+            cursor.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(self.FETCH_SIZE)
+                if not rows:
+                    break
+                for row in rows:
+                    yield dict(zip(columns, row))
+        finally:
+            if pooled:
+                self._release(conn)
+    
+    def iter_active_notams(self, min_score: int = 0,
+                           columns: Optional[Iterable[str]] = None) -> Iterator[Dict]:
+        """
+        Iterate over currently active NOTAMs.
+        
+        Args:
+            min_score: Minimum priority score filter
+            columns: Columns to return (default: all; see SUMMARY_COLUMNS)
+            
+        Returns:
+            Iterator of NOTAM dictionaries
+        """
+        return self._iter_notams(
+            _ACTIVE_NOTAMS_SQL, (min_score, int(time.time())), columns
+        )
+    
+    def get_active_notams(self, min_score: int = 0,
+                          columns: Optional[Iterable[str]] = None) -> List[Dict]:
         """
         Get currently active NOTAMs.
         
         Args:
             min_score: Minimum priority score filter
+            columns: Columns to return (default: all; see SUMMARY_COLUMNS)
             
         Returns:
             List of NOTAM dictionaries
         """
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            
-            # Active = valid_to is NULL (permanent) OR valid_to > now
-            # AND not cancelled/expired (notam_type != 'CANCEL')
-            cursor.execute('''
-                SELECT * FROM notams
-                WHERE (valid_to IS NULL OR valid_to > datetime('now'))
-                  AND (notam_type != 'CANCEL' OR notam_type IS NULL)
-                  AND priority_score >= ?
-                ORDER BY priority_score DESC, valid_from DESC
-            ''', (min_score,))
+        return list(self.iter_active_notams(min_score, columns))
+    
+    def iter_closures(self, active_only: bool = True,
+                      columns: Optional[Iterable[str]] = None) -> Iterator[Dict]:
+        """
+        Iterate over closure NOTAMs.
+        
+        Args:
+            active_only: If True, only return active closures
+            columns: Columns to return (default: all; see SUMMARY_COLUMNS)
             
-            return [dict(row) for row in cursor.fetchall()]
+        Returns:
+            Iterator of NOTAM dictionaries
+        """
+        if active_only:
+            return self._iter_notams(
+                _CLOSURES_ACTIVE_SQL, (int(time.time()),), columns
+            )
+        return self._iter_notams(_CLOSURES_ALL_SQL, (), columns)
     
-    def get_closures(self, active_only: bool = True) -> List[Dict]:
+    def get_closures(self, active_only: bool = True,
+                     columns: Optional[Iterable[str]] = None) -> List[Dict]:
         """
         Get closure NOTAMs.
         
         Args:
             active_only: If True, only return active closures
+            columns: Columns to return (default: all; see SUMMARY_COLUMNS)
             
         Returns:
             List of NOTAM dictionaries
         """
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            
-            query = '''
-                SELECT * FROM notams
-                WHERE is_closure = 1
-            '''
-            
-            if active_only:
-                query += ''' AND (valid_to IS NULL OR valid_to > datetime('now'))
-                              AND (notam_type != 'CANCEL' OR notam_type IS NULL)'''
-            
-            query += ' ORDER BY priority_score DESC, valid_from DESC'
+        return list(self.iter_closures(active_only, columns))
+    
+    def iter_drone_notams(self, active_only: bool = True,
+                          columns: Optional[Iterable[str]] = None) -> Iterator[Dict]:
+        """
+        Iterate over drone-related NOTAMs.
+        
+        Args:
+            active_only: If True, only return active NOTAMs
+            columns: Columns to return (default: all; see SUMMARY_COLUMNS)
             
-            cursor.execute(query)
-            return [dict(row) for row in cursor.fetchall()]
+        Returns:
+            Iterator of NOTAM dictionaries
+        """
+        if active_only:
+            return self._iter_notams(
+                _DRONE_ACTIVE_SQL, (int(time.time()),), columns
+            )
+        return self._iter_notams(_DRONE_ALL_SQL, (), columns)
     
-    def get_drone_notams(self, active_only: bool = True) -> List[Dict]:
+    def get_drone_notams(self, active_only: bool = True,
+                         columns: Optional[Iterable[str]] = None) -> List[Dict]:
         """
         Get drone-related NOTAMs.
         
         Args:
             active_only: If True, only return active NOTAMs
+            columns: Columns to return (default: all; see SUMMARY_COLUMNS)
             
         Returns:
             List of NOTAM dictionaries
         """
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            
-            query = '''
-                SELECT * FROM notams
-                WHERE is_drone_related = 1
-            '''
-            
-            if active_only:
-                query += ''' AND (valid_to IS NULL OR valid_to > datetime('now'))
-                              AND (notam_type != 'CANCEL' OR notam_type IS NULL)'''
-            
-            query += ' ORDER BY priority_score DESC, valid_from DESC'
+        return list(self.iter_drone_notams(active_only, columns))
+    
+    def iter_by_search_term(self, term: str, active_only: bool = True,
+                            columns: Optional[Iterable[str]] = None) -> Iterator[Dict]:
+        """
+        Iterate over NOTAMs by search term.
+        
+        Args:
+            term: Search term
+            active_only: If True, only return active NOTAMs
+            columns: Columns to return (default: all; see SUMMARY_COLUMNS)
             
-            cursor.execute(query)
-            return [dict(row) for row in cursor.fetchall()]
+        Returns:
+            Iterator of NOTAM dictionaries
+        """
+        if active_only:
+            return self._iter_notams(
+                _BY_SEARCH_TERM_ACTIVE_SQL, (term, int(time.time())), columns
+            )
+        return self._iter_notams(_BY_SEARCH_TERM_ALL_SQL, (term,), columns)
     
-    def get_by_search_term(self, term: str, active_only: bool = True) -> List[Dict]:
+    def get_by_search_term(self, term: str, active_only: bool = True,
+                           columns: Optional[Iterable[str]] = None) -> List[Dict]:
         """
         Get NOTAMs by search term.
         
         Args:
             term: Search term
             active_only: If True, only return active NOTAMs
+            columns: Columns to return (default: all; see SUMMARY_COLUMNS)
             
         Returns:
             List of NOTAM dictionaries
         """
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            
-            query = '''
-                SELECT * FROM notams
-                WHERE search_term = ?
-            '''
-            
-            if active_only:
-                query += ''' AND (valid_to IS NULL OR valid_to > datetime('now'))
-                              AND (notam_type != 'CANCEL' OR notam_type IS NULL)'''
-            
-            query += ' ORDER BY priority_score DESC, valid_from DESC'
+        return list(self.iter_by_search_term(term, active_only, columns))
+    
+    def iter_by_airport(self, airport_code: str, active_only: bool = True,
+                        columns: Optional[Iterable[str]] = None) -> Iterator[Dict]:
+        """
+        Iterate over NOTAMs by airport code.
+        
+        Args:
+            airport_code: ICAO airport code
+            active_only: If True, only return active NOTAMs
+            columns: Columns to return (default: all; see SUMMARY_COLUMNS)
             
-            cursor.execute(query, (term,))
-            return [dict(row) for row in cursor.fetchall()]
+        Returns:
+            Iterator of NOTAM dictionaries
+        """
+        if active_only:
+            return self._iter_notams(
+                _BY_AIRPORT_ACTIVE_SQL, (airport_code, int(time.time())), columns
+            )
+        return self._iter_notams(_BY_AIRPORT_ALL_SQL, (airport_code,), columns)
     
-    def get_by_airport(self, airport_code: str, active_only: bool = True) -> List[Dict]:
+    def get_by_airport(self, airport_code: str, active_only: bool = True,
+                       columns: Optional[Iterable[str]] = None) -> List[Dict]:
         """
         Get NOTAMs by airport code.
         
         Args:
             airport_code: ICAO airport code
             active_only: If True, only return active NOTAMs
+            columns: Columns to return (default: all; see SUMMARY_COLUMNS)
             
         Returns:
             List of NOTAM dictionaries
         """
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            
-            query = '''
-                SELECT * FROM notams
-                WHERE airport_code = ?
-            '''
+        return list(self.iter_by_airport(airport_code, active_only, columns))
+    
+    def iter_search_body(self, text: str, active_only: bool = True,
+                         columns: Optional[Iterable[str]] = None) -> Iterator[Dict]:
+        """
+        Iterate over NOTAMs whose body matches a full-text query.
+        
+        Args:
+            text: FTS5 query, e.g. 'drone', 'uas OR uav', '"runway closed"'
+                or 'clos*'; malformed queries raise sqlite3.OperationalError
+            active_only: If True, only return active NOTAMs
+            columns: Columns to return (default: all; see SUMMARY_COLUMNS)
             
-            if active_only:
-                query += ''' AND (valid_to IS NULL OR valid_to > datetime('now'))
-                              AND (notam_type != 'CANCEL' OR notam_type IS NULL)'''
+        Returns:
+            Iterator of NOTAM dictionaries
+        """
+        if active_only:
+            return self._iter_notams(
+                _SEARCH_BODY_ACTIVE_SQL, (text, int(time.time())), columns
+            )
+        return self._iter_notams(_SEARCH_BODY_ALL_SQL, (text,), columns)
+    
+    def search_body(self, text: str, active_only: bool = True,
+                    columns: Optional[Iterable[str]] = None) -> List[Dict]:
+        """
+        Get NOTAMs whose body matches a full-text query.
+        
+        Args:
+            text: FTS5 query (see iter_search_body)
+            active_only: If True, only return active NOTAMs
+            columns: Columns to return (default: all; see SUMMARY_COLUMNS)
             
-            query += ' ORDER BY priority_score DESC, valid_from DESC'
+        Returns:
+            List of NOTAM dictionaries
+        """
+        return list(self.iter_search_body(text, active_only, columns))
+    
+    def _purge_in_chunks(self, query: str, params: tuple) -> int:
+        """
+        Run a bounded DELETE repeatedly until it removes a short chunk.
+        
+        Each chunk commits on its own, so the write lock is released between
+        chunks and the WAL never has to absorb one huge transaction.
+        
+        Args:
+            query: DELETE statement whose last parameter is the chunk size
+            params: Parameters preceding the chunk size
             
-            cursor.execute(query, (airport_code,))
-            return [dict(row) for row in cursor.fetchall()]
+        Returns:
+            Total number of records deleted
+        """
+        params += (self.PURGE_CHUNK_SIZE,)
+        total = 0
+        while True:
+            with self.get_connection() as conn:
+                deleted = conn.execute(query, params).rowcount
+            total += deleted
+            if deleted < self.PURGE_CHUNK_SIZE:
+                return total
     
     def purge_expired(self, days_after_expiry: int = 30) -> int:
         """
@@ -506,19 +1021,15 @@ class NotamDatabase:
         Returns:
             Number of records deleted
         """
-        cutoff = (datetime.now() - timedelta(days=days_after_expiry)).isoformat()
+        cutoff = datetime.now() - timedelta(days=days_after_expiry)
         
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                DELETE FROM notams
-                WHERE valid_to IS NOT NULL
-                  AND valid_to < ?
-            ''', (cutoff,))
-            
-            count = cursor.rowcount
-            logger.info(f"Purged {count} expired NOTAMs (older than {cutoff})")
-            return count
+        # Range delete on the valid_to_ts index; NULL (permanent) never matches
+        count = self._purge_in_chunks(
+            _PURGE_EXPIRED_SQL,
+            (int(time.time()) - days_after_expiry * 86400,)
+        )
+        logger.info(f"Purged {count} expired NOTAMs (older than {cutoff.isoformat()})")
+        return count
     
     def purge_cancelled(self, days_after_cancel: int = 7) -> int:
         """
@@ -532,17 +1043,9 @@ class NotamDatabase:
         """
         cutoff = (datetime.now() - timedelta(days=days_after_cancel)).isoformat()
         
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                DELETE FROM notams
-                WHERE notam_type = 'CANCEL'
-                  AND updated_at < ?
-            ''', (cutoff,))
-            
-            count = cursor.rowcount
-            logger.info(f"Purged {count} cancelled NOTAMs (older than {cutoff})")
-            return count
+        count = self._purge_in_chunks(_PURGE_CANCELLED_SQL, (cutoff,))
+        logger.info(f"Purged {count} cancelled NOTAMs (older than {cutoff})")
+        return count
     
     def purge_old_search_runs(self, keep_days: int = 90) -> int:
         """
@@ -556,74 +1059,78 @@ class NotamDatabase:
         """
         cutoff = (datetime.now() - timedelta(days=keep_days)).isoformat()
         
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                DELETE FROM search_runs
-                WHERE run_at < ?
-            ''', (cutoff,))
-            
-            count = cursor.rowcount
-            logger.info(f"Purged {count} old search run records")
-            return count
+        count = self._purge_in_chunks(_PURGE_SEARCH_RUNS_SQL, (cutoff,))
+        logger.info(f"Purged {count} old search run records")
+        return count
     
-    def execute_custom_query(self, query: str) -> List[Dict]:
-        """Execute a custom SQL query."""
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(query)
+    def execute_custom_query(self, query: str, params: tuple = ()) -> List[Dict]:
+        """
+        Execute a custom SQL query.
+        
+        Runs on a separate read-only connection, so long report scans never
+        hold up ingest and cannot modify the database.
+        
+        Args:
+            query: SQL text
+            params: Values for any ? placeholders in the query
+        """
+        with self._ro_lock:
+            cursor = self._read_only().execute(query, params)
             return [dict(row) for row in cursor.fetchall()]
     
     def get_statistics(self) -> Dict:
         """Get summary statistics."""
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            
-            stats = {}
-            
-            # Total NOTAMs
-            cursor.execute('SELECT COUNT(*) as total FROM notams')
-            stats['total_notams'] = cursor.fetchone()['total']
-            
-            # Active NOTAMs
-            cursor.execute('''
-                SELECT COUNT(*) as active FROM notams
-                WHERE (valid_to IS NULL OR valid_to > datetime('now'))
-                  AND (notam_type != 'CANCEL' OR notam_type IS NULL)
-            ''')
-            stats['active_notams'] = cursor.fetchone()['active']
-            
-            # Closures
-            cursor.execute('SELECT COUNT(*) as closures FROM notams WHERE is_closure = 1')
-            stats['closures'] = cursor.fetchone()['closures']
-            
-            # Active closures
-            cursor.execute('''
-                SELECT COUNT(*) as active_closures FROM notams
-                WHERE is_closure = 1
-                  AND (valid_to IS NULL OR valid_to > datetime('now'))
-                  AND (notam_type != 'CANCEL' OR notam_type IS NULL)
-            ''')
-            stats['active_closures'] = cursor.fetchone()['active_closures']
-            
-            # Drone-related
-            cursor.execute('SELECT COUNT(*) as drone FROM notams WHERE is_drone_related = 1')
-            stats['drone_notams'] = cursor.fetchone()['drone']
-            
-            # Active drone
-            cursor.execute('''
-                SELECT COUNT(*) as active_drone FROM notams
-                WHERE is_drone_related = 1
-                  AND (valid_to IS NULL OR valid_to > datetime('now'))
-                  AND (notam_type != 'CANCEL' OR notam_type IS NULL)
-            ''')
-            stats['active_drone_notams'] = cursor.fetchone()['active_drone']
-            
-            # High priority (score >= 80)
-            cursor.execute('''
-                SELECT COUNT(*) as high_priority FROM notams
-                WHERE priority_score >= 80
-            ''')
-            stats['high_priority'] = cursor.fetchone()['high_priority']
-            
-            return stats
\ No newline at end of file
+        # One pass over the table; each counter is a conditional sum
+        (total, active, closures, active_closures,
+         drone, active_drone, high_priority) = self._read(
+            _STATISTICS_SQL, (int(time.time()),)
+        )[0]
+        
+        return {
+            'total_notams': total,
+            'active_notams': active,
+            'closures': closures,
+            'active_closures': active_closures,
+            'drone_notams': drone,
+            'active_drone_notams': active_drone,
+            'high_priority': high_priority,
+        }
+
+
+# Open databases by resolved path, so every component in a process shares
+# one writer (and its lock) instead of contending through separate ones
+_databases: Dict[str, NotamDatabase] = {}
+_databases_lock = threading.Lock()
+
+
+def get_database(db_path: str) -> NotamDatabase:
+    """
+    Return the process-wide NotamDatabase for a path, opening it on first use.
+    
+    Args:
+        db_path: Path to the SQLite database file
+        
+    Returns:
+        The shared NotamDatabase instance
+    """
+    key = str(Path(db_path).resolve())
+    with _databases_lock:
+        db = _databases.get(key)
+        if db is None:
+            db = _databases[key] = NotamDatabase(db_path)
+        return db
+
+
+def close_database(db_path: str) -> None:
+    """
+    Close the shared NotamDatabase for a path and forget it, so the next
+    get_database() call opens a fresh one. Does nothing if none is open.
+    
+    Args:
+        db_path: Path to the SQLite database file
+    """
+    key = str(Path(db_path).resolve())
+    with _databases_lock:
+        db = _databases.pop(key, None)
+    if db is not None:
+        db.close()
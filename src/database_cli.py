@@ -27,7 +27,7 @@ def main():
     
     args = parser.parse_args()
     
-    config = Config()
+    config = Config
     db = NotamDatabase(config.DATABASE_PATH)
     
     if args.purge_all:
@@ -1,15 +1,27 @@
 """Main application module."""
+import argparse
+import atexit
 import logging
+import multiprocessing
+import os
+import random
+import sqlite3
 import time
 import sys
-from typing import Optional, Tuple
+from datetime import timezone
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import requests
 
 from src.config import Config
-from src.database import NotamDatabase
+from src.database import get_database
 from src.notam_client import get_notam_client, BaseNotamClient
 from src.parser import NotamParser
 from src.alerts import NtfyAlerter
-from src.models.notam import Notam
+from src.models.notam import Notam, NotamType
 from src.alert_digester import AlertDigester
 
 # Configure logging from environment
@@ -21,112 +33,307 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Batches at least this large are parsed across a process pool; below it
+# the cost of shipping records to workers outweighs the parallelism
+PARSE_POOL_THRESHOLD = 200
 
-class NotamMonitor:
-    """Main application class for monitoring NOTAMs by airport."""
+# Log-line verb indexed by was_inserted
+_VERBS = ('Updated', 'Inserted')
+
+# Log-line suffix indexed by Notam.flags (FLAG_DRONE | FLAG_CLOSURE)
+_FLAG_SUFFIXES = ('', ' [ DRONE]', ' [ CLOSURE]', ' [ DRONE] [ CLOSURE]')
+
+_parse_pool: Optional[ProcessPoolExecutor] = None
+_worker_parser: Optional[NotamParser] = None
+
+
+def _parse_in_worker(raw_notam: Dict) -> Optional[Notam]:
+    """Parse one record inside a pool worker, skipping it on failure."""
+    global _worker_parser
+    if _worker_parser is None:
+        _worker_parser = NotamParser()
+    try:
+        return _worker_parser.parse_notam(raw_notam)
+    except Exception as e:
+        logger.error(f"Error parsing NOTAM: {e}", exc_info=True)
+        return None
+
+
+def parse_notams(parser: NotamParser, raw_notams: List[Dict]) -> List[Notam]:
+    """
+    Parse raw API records, skipping any that fail.
+    
+    When PARSE_WORKERS is above 1 (or 0, one per CPU), large batches are
+    spread over a process pool created on first use. Workers are started
+    with forkserver so they never inherit the database connections or the
+    client threads. If the pool breaks it is dropped and the batch is
+    parsed in-process; everything else is always parsed in-process.
+    
+    Args:
+        parser: Parser used for in-process parsing
+        raw_notams: NOTAM dictionaries from the API
+        
+    Returns:
+        Parsed Notam objects, in input order
+    """
+    global _parse_pool
+    workers = Config.PARSE_WORKERS or os.cpu_count() or 1
+    if len(raw_notams) >= PARSE_POOL_THRESHOLD and workers > 1:
+        if _parse_pool is None:
+            _parse_pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context('forkserver')
+            )
+            atexit.register(_parse_pool.shutdown)
+        chunksize = max(1, len(raw_notams) // (8 * workers))
+        try:
+            results = _parse_pool.map(_parse_in_worker, raw_notams, chunksize=chunksize)
+            return [notam for notam in results if notam]
+        except BrokenProcessPool as e:
+            logger.warning(f"Parse pool broke, parsing batch in-process: {e}")
+            _parse_pool.shutdown(wait=False)
+            _parse_pool = None
+    
+    parsed = []
+    for raw_notam in raw_notams:
+        try:
+            notam = parser.parse_notam(raw_notam)
+            if notam:
+                parsed.append(notam)
+        except Exception as e:
+            logger.error(f"Error parsing NOTAM: {e}", exc_info=True)
+    return parsed
+
+
+class BaseMonitor(ABC):
+    """
+    Shared setup, cycle and scheduling logic for the NOTAM monitors.
+    Subclasses choose the client mode and implement process().
+    """
+    
+    # Mode passed to get_notam_client()
+    CLIENT_MODE = 'airport'
+    
+    # Word used in the cycle banners ("Starting NOTAM update cycle")
+    CYCLE_NAME = 'update'
+    
+    # Word used for continuous mode ("Starting continuous monitoring mode")
+    MODE_NAME = 'monitoring'
+    
+    # NOTAMs parsed and stored per transaction while the fetch is running
+    STORE_BATCH_SIZE = 256
+    
+    # Attempts at a failing cycle before the error is treated as fatal,
+    # with exponential backoff (1s, 2s, 4s, ... capped) plus jitter between
+    RETRY_ATTEMPTS = 6
+    RETRY_MAX_DELAY = 60
+    
+    # How long the incrementally updated statistics are trusted before
+    # they are recounted from the database
+    STATS_REFRESH_SECONDS = 3600
     
     def __init__(self):
-        """Initialize the NOTAM monitor."""
-        self.config = Config()
+        """Initialize the monitor's database, client, parser and alerter."""
+        self.config = Config
         self.config.validate()
         
-        self.db = NotamDatabase(self.config.DATABASE_PATH)
-        self.client = get_notam_client(mode='airport')
+        self.db = get_database(self.config.DATABASE_PATH)
+        self.client = get_notam_client(mode=self.CLIENT_MODE)
         self.parser = NotamParser()
         self.alerter = NtfyAlerter()
-        
+        self._last_purge: Optional[float] = None
+        self._stats: Optional[Dict] = None
+        self._stats_time = 0.0
+        # notam_id -> was_inserted for every NOTAM stored this cycle, kept
+        # across retries so a re-stored NOTAM is counted and alerted once
+        self._cycle_stored: Dict[str, bool] = {}
+    
+    def _log_banner(self, title: str, target: str) -> None:
+        """Log the startup banner."""
         logger.info("=" * 80)
-        logger.info("NOTAM Airport Monitor initialized")
+        logger.info(f"{title} initialized")
         logger.info(f"Software Version: {self.config.VERSION}")
         logger.info(f"API Endpoint: {self.config.NOTAM_API_URL}")
-        logger.info(f"Monitoring {len(self.config.AIRPORTS)} airport(s)")
+        logger.info(target)
         logger.info(f"Database: {self.config.DATABASE_PATH}")
         logger.info(f"Request delay: {self.config.MIN_REQUEST_DELAY}-{self.config.MAX_REQUEST_DELAY}s")
         logger.info(f"Drone keywords: {', '.join(self.config.DRONE_KEYWORDS[:5])}...")
         logger.info("=" * 80)
     
-    def process_notams(self) -> Tuple[int, int, int]:
+    @abstractmethod
+    def process(self) -> Tuple[int, int, int]:
         """
-        Fetch and process NOTAMs.
+        Fetch and process one batch of NOTAMs.
         
         Returns:
             Tuple of (fetched_count, inserted_count, updated_count)
         """
-        logger.info("Fetching NOTAMs from API...")
+        pass
+    
+    def _fetch_batches(self) -> Iterator[List[Dict]]:
+        """
+        Stream NOTAMs from the client in batches of STORE_BATCH_SIZE, so
+        each batch is stored while later airports/terms are still fetching.
         
-        # Fetch NOTAMs
-        notams = self.client.fetch_all_notams()
+        Yields:
+            Lists of NOTAM dictionaries from the API
+        """
+        batch = []
+        for raw in self.client.iter_all_notams():
+            batch.append(raw)
+            if len(batch) >= self.STORE_BATCH_SIZE:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+    
+    def _store(self, raw_notams: List[Dict]) -> List[Tuple[Notam, bool]]:
+        """
+        Parse a fetched batch and write it in one transaction.
         
-        if not notams:
-            logger.warning("No NOTAMs retrieved from API")
-            return 0, 0, 0
+        If the batch write fails, the NOTAMs are written one at a time so
+        only the records that fail on their own are lost.
+        
+        Args:
+            raw_notams: NOTAM dictionaries from the API
+            
+        Returns:
+            (notam, was_inserted) pairs for every NOTAM stored for the first
+            time this cycle; those already stored by an earlier attempt or
+            batch are left out
+            
+        Raises:
+            sqlite3.OperationalError: If the database is locked or unavailable,
+                so the cycle is retried
+        """
+        notams_parsed = parse_notams(self.parser, raw_notams)
+        
+        # One transaction for the whole batch instead of a commit per NOTAM
+        try:
+            results = self.db.upsert_notams(notams_parsed)
+        except sqlite3.OperationalError:
+            raise
+        except Exception as e:
+            logger.error(f"Error storing NOTAM batch, storing one at a time: {e}")
+            stored = self._store_each(notams_parsed)
+        else:
+            stored = [
+                (notam, was_inserted)
+                for notam, (row_id, was_inserted) in zip(notams_parsed, results)
+            ]
         
-        logger.info(f"Retrieved {len(notams)} NOTAM(s), processing...")
+        seen = self._cycle_stored
+        first_stored = []
+        for notam, was_inserted in stored:
+            if notam.notam_id not in seen:
+                seen[notam.notam_id] = was_inserted
+                first_stored.append((notam, was_inserted))
         
-        # Process each NOTAM
-        inserted = 0
-        updated = 0
+        if self._stats is not None:
+            self._count_inserted(notam for notam, was_inserted in first_stored if was_inserted)
+        return first_stored
+    
+    def _store_each(self, notams: List[Notam]) -> List[Tuple[Notam, bool]]:
+        """
+        Write NOTAMs one transaction each, skipping any that fail.
         
-        for raw_notam in notams:
+        Args:
+            notams: Parsed NOTAMs from a batch that could not be written whole
+            
+        Returns:
+            (notam, was_inserted) pairs for every stored NOTAM
+            
+        Raises:
+            sqlite3.OperationalError: If the database is locked or unavailable
+        """
+        stored = []
+        for notam in notams:
             try:
-                notam = self.parser.parse_notam(raw_notam)
-                
-                if notam:
-                    row_id, was_inserted = self.db.upsert_notam(notam)
-                    
-                    if was_inserted:
-                        inserted += 1
-                    else:
-                        updated += 1
-                    
-                    # Send alert if needed
-                    if self.alerter.should_alert(notam):
-                        self.alerter.send(notam)
-                    
-                    # Log at appropriate level
-                    log_msg = (
-                        f"{'Inserted' if was_inserted else 'Updated'}: {notam.notam_id} | "
-                        f"{notam.airport_code or notam.location or 'N/A'} | "
-                        f"Score: {notam.priority_score}"
-                    )
-                    
-                    if notam.is_drone_related:
-                        log_msg += " [ DRONE]"
-                    if notam.is_closure:
-                        log_msg += " [ CLOSURE]"
-                    
-                    logger.info(log_msg)
-                    
+                row_id, was_inserted = self.db.upsert_notam(notam)
+            except sqlite3.OperationalError:
+                raise
             except Exception as e:
-                logger.error(f"Error processing NOTAM: {e}", exc_info=True)
+                logger.error(f"Error storing NOTAM {notam.notam_id}: {e}", exc_info=True)
+                continue
+            stored.append((notam, was_inserted))
+        return stored
+    
+    def _count_inserted(self, notams) -> None:
+        """
+        Add newly inserted NOTAMs to the cached statistics.
         
-        # Log search run
-        self.db.log_search_run(
-            mode='airport',
-            airport_codes=self.config.AIRPORTS,
-            total_fetched=len(notams),
-            new_inserted=inserted,
-            updated=updated
-        )
+        Mirrors the classification in NotamDatabase.get_statistics(). Updates
+        to existing rows and NOTAMs expiring since the last recount are not
+        tracked; the periodic recount corrects that drift.
+        """
+        stats = self._stats
+        now = time.time()
+        for notam in notams:
+            valid_to = notam.valid_to
+            active = (
+                (valid_to is None or valid_to.replace(tzinfo=timezone.utc).timestamp() > now)
+                and notam.notam_type != NotamType.CANCEL
+            )
+            flags = notam.flags
+            closure = bool(flags & Notam.FLAG_CLOSURE)
+            drone = bool(flags & Notam.FLAG_DRONE)
+            stats['total_notams'] += 1
+            stats['active_notams'] += active
+            stats['closures'] += closure
+            stats['active_closures'] += closure and active
+            stats['drone_notams'] += drone
+            stats['active_drone_notams'] += drone and active
+            stats['high_priority'] += notam.priority_score >= 80
+    
+    def _statistics(self) -> Dict:
+        """
+        Database statistics for the cycle summary.
         
-        logger.info(
-            f"Processing complete: {len(notams)} fetched, "
-            f"{inserted} new, {updated} updated"
-        )
-        return len(notams), inserted, updated
+        Counted from the database on the first cycle, after a purge and
+        every STATS_REFRESH_SECONDS; in between, kept current by _store().
+        """
+        now = time.monotonic()
+        if self._stats is None or now - self._stats_time >= self.STATS_REFRESH_SECONDS:
+            self._stats = self.db.get_statistics()
+            self._stats_time = now
+        return self._stats
+    
+    def _process_with_retry(self) -> Tuple[int, int, int]:
+        """
+        Run process(), retrying transient network and database errors.
+        
+        Upserts are idempotent and _store() only hands back NOTAMs not yet
+        stored this cycle, so a retry neither double-counts nor re-alerts
+        what an earlier attempt already stored. The last failure is
+        re-raised once RETRY_ATTEMPTS are used up.
+        """
+        self._cycle_stored = {}
+        for attempt in range(self.RETRY_ATTEMPTS):
+            try:
+                return self.process()
+            except (requests.RequestException, sqlite3.OperationalError) as e:
+                if attempt == self.RETRY_ATTEMPTS - 1:
+                    raise
+                delay = min(self.RETRY_MAX_DELAY, 2 ** attempt) + random.random()
+                logger.warning(
+                    f"Cycle failed ({e}); retry {attempt + 1}/{self.RETRY_ATTEMPTS - 1} "
+                    f"in {delay:.1f}s"
+                )
+                time.sleep(delay)
     
     def run_once(self):
         """Run a single update cycle."""
         logger.info("=" * 80)
-        logger.info("Starting NOTAM update cycle")
+        logger.info(f"Starting NOTAM {self.CYCLE_NAME} cycle")
         logger.info("=" * 80)
         
-        start_time = time.time()
-        fetched, inserted, updated = self.process_notams()
-        elapsed = time.time() - start_time
+        # Monotonic, so NTP steps don't skew the reported cycle time
+        start_ns = time.perf_counter_ns()
+        fetched, inserted, updated = self._process_with_retry()
+        elapsed_ns = time.perf_counter_ns() - start_ns
         
         # Display statistics
-        stats = self.db.get_statistics()
+        stats = self._statistics()
         logger.info("=" * 80)
         logger.info("Database Statistics:")
         logger.info(f"  Total NOTAMs in DB: {stats['total_notams']}")
@@ -135,64 +342,191 @@ class NotamMonitor:
         logger.info(f"  Active closures: {stats['active_closures']}")
         logger.info(f"  Drone-related: {stats['drone_notams']}")
         logger.info(f"  High priority (80+): {stats['high_priority']}")
-        logger.info(f"  Cycle time: {elapsed:.2f}s")
+        logger.info(f"  Cycle time: {elapsed_ns / 1e9:.2f}s")
         logger.info("=" * 80)
-        logger.info("Update cycle complete")
+        logger.info(f"{self.CYCLE_NAME.capitalize()} cycle complete")
         logger.info("=" * 80)
         
         return inserted
     
+    def _purge_due(self) -> bool:
+        """
+        Check whether the purge routines should run this cycle.
+        
+        True on the first cycle and then once PURGE_INTERVAL_SECONDS have
+        passed since the last purge; records the purge time when True.
+        """
+        now = time.monotonic()
+        last = self._last_purge
+        if last is not None and now - last < self.config.PURGE_INTERVAL_SECONDS:
+            return False
+        self._last_purge = now
+        return True
+    
+    def _purge(self) -> None:
+        """Delete expired and cancelled NOTAMs."""
+        self.db.purge_expired(self.config.PURGE_EXPIRED_AFTER_DAYS)
+        self.db.purge_cancelled(self.config.PURGE_CANCELLED_AFTER_DAYS)
+        # Recount on the next cycle rather than tracking deleted rows
+        self._stats = None
+    
+    def shutdown(self) -> None:
+        """Release resources when monitoring is stopped."""
+        self.client.close()
+        self.alerter.flush()
+    
     def run_continuous(self):
         """Run continuous monitoring with periodic updates."""
-        logger.info("Starting continuous monitoring mode")
+        logger.info(f"Starting continuous {self.MODE_NAME} mode")
         logger.info(f"Update interval: {self.config.UPDATE_INTERVAL_SECONDS}s")
         
+        deadline = time.monotonic()
         try:
             while True:
-                self.run_once()
+                try:
+                    self.run_once()
+                    
+                    # Run purge routines at most once per PURGE_INTERVAL_SECONDS
+                    if self._purge_due():
+                        self._purge()
+                    self.db.optimize()
+                except (requests.RequestException, sqlite3.OperationalError) as e:
+                    # Retries are used up; keep running and try again next cycle
+                    logger.error(f"Cycle failed, skipping until the next update: {e}")
                 
-                # Run purge routines occasionally (e.g., once per day)
-                # For simplicity, run on every cycle - can be optimized
-                self.db.purge_expired(self.config.PURGE_EXPIRED_AFTER_DAYS)
-                self.db.purge_cancelled(self.config.PURGE_CANCELLED_AFTER_DAYS)
+                # Sleep to a fixed cadence, not interval + cycle time
+                deadline += self.config.UPDATE_INTERVAL_SECONDS
+                remaining = deadline - time.monotonic()
+                if remaining < 0:
+                    logger.warning(
+                        f"Cycle overran the update interval by {-remaining:.1f}s; "
+                        f"consider raising UPDATE_INTERVAL_SECONDS"
+                    )
+                    # Start a fresh cadence rather than running back-to-back cycles
+                    deadline = time.monotonic()
+                    remaining = 0.0
                 
-                logger.info(f"Next update in {self.config.UPDATE_INTERVAL_SECONDS}s...")
+                logger.info(f"Next update in {remaining:.0f}s...")
                 logger.info("")
-                time.sleep(self.config.UPDATE_INTERVAL_SECONDS)
+                time.sleep(remaining)
                 
         except KeyboardInterrupt:
-            logger.info("Monitoring stopped by user")
+            logger.info(f"{self.MODE_NAME.capitalize()} stopped by user")
+            self.shutdown()
         except Exception as e:
             logger.error(f"Fatal error: {e}", exc_info=True)
             sys.exit(1)
 
 
-class SearchMonitor:
+class NotamMonitor(BaseMonitor):
+    """Main application class for monitoring NOTAMs by airport."""
+    
+    def __init__(self):
+        """Initialize the NOTAM monitor."""
+        super().__init__()
+        self._log_banner(
+            "NOTAM Airport Monitor",
+            f"Monitoring {len(self.config.AIRPORTS)} airport(s)"
+        )
+    
+    def process(self) -> Tuple[int, int, int]:
+        """Fetch and process NOTAMs for the configured airports."""
+        return self.process_notams()
+    
+    def process_notams(self) -> Tuple[int, int, int]:
+        """
+        Fetch and process NOTAMs.
+        
+        Returns:
+            Tuple of (fetched_count, inserted_count, updated_count)
+        """
+        logger.info("Fetching NOTAMs from API...")
+        
+        # Process each NOTAM as its batch arrives
+        fetched = 0
+        
+        # Bound once for the loop; per-NOTAM lines are only built if logged
+        should_alert = self.alerter.should_alert
+        send_alert = self.alerter.enqueue
+        log_each = logger.isEnabledFor(logging.INFO)
+        # Tracebacks only for the first failure per cycle unless debugging
+        trace_all = logger.isEnabledFor(logging.DEBUG)
+        errors = 0
+        
+        for batch in self._fetch_batches():
+            fetched += len(batch)
+            for notam, was_inserted in self._store(batch):
+                try:
+                    # Queue alert if needed; a background thread sends it
+                    if should_alert(notam):
+                        send_alert(notam)
+                    
+                    # Log at appropriate level
+                    if log_each:
+                        logger.info(
+                            "%s: %s | %s | Score: %s%s",
+                            _VERBS[was_inserted],
+                            notam.notam_id,
+                            notam.display_location,
+                            notam.priority_score,
+                            _FLAG_SUFFIXES[notam.flags]
+                        )
+                    
+                except Exception as e:
+                    logger.error(
+                        "Error processing NOTAM %s: %s", notam.notam_id, e,
+                        exc_info=trace_all or not errors
+                    )
+                    errors += 1
+            
+        # Counted over the whole cycle, including NOTAMs stored by an
+        # attempt that was then retried
+        inserted = sum(self._cycle_stored.values())
+        updated = len(self._cycle_stored) - inserted
+        
+        # Nothing to record on an empty (e.g. off-hours) poll
+        if fetched == 0:
+            logger.warning("No NOTAMs retrieved from API")
+            return 0, 0, 0
+        
+        # Log search run
+        self.db.log_search_run(
+            mode='airport',
+            airport_codes=self.config.AIRPORTS,
+            total_fetched=fetched,
+            new_inserted=inserted,
+            updated=updated
+        )
+        
+        logger.info(
+            "Processing complete: %d fetched, %d new, %d updated",
+            fetched, inserted, updated
+        )
+        return fetched, inserted, updated
+
+
+class SearchMonitor(BaseMonitor):
     """
     Runs free-text NOTAM searches for configured SEARCH_TERMS.
-    Mirrors the structure of NotamMonitor but uses FreeTextNotamClient.
+    Uses FreeTextNotamClient and batches alerts through an AlertDigester.
     """
     
+    CLIENT_MODE = 'search'
+    CYCLE_NAME = 'search'
+    MODE_NAME = 'search'
+    
     def __init__(self):
         """Initialize the search monitor."""
-        self.config = Config()
-        self.config.validate()
-        
-        self.db = NotamDatabase(self.config.DATABASE_PATH)
-        self.client = get_notam_client(mode='search')
-        self.parser = NotamParser()
-        self.alerter = NtfyAlerter()
+        super().__init__()
         self.alert_digester = AlertDigester() if self.config.NTFY_URL else None
-        
-        logger.info("=" * 80)
-        logger.info("NOTAM Search Monitor initialized")
-        logger.info(f"Software Version: {self.config.VERSION}")
-        logger.info(f"API Endpoint: {self.config.NOTAM_API_URL}")
-        logger.info(f"Search terms: {', '.join(self.config.SEARCH_TERMS)}")
-        logger.info(f"Database: {self.config.DATABASE_PATH}")
-        logger.info(f"Request delay: {self.config.MIN_REQUEST_DELAY}-{self.config.MAX_REQUEST_DELAY}s")
-        logger.info(f"Drone keywords: {', '.join(self.config.DRONE_KEYWORDS[:5])}...")
-        logger.info("=" * 80)
+        self._log_banner(
+            "NOTAM Search Monitor",
+            f"Search terms: {', '.join(self.config.SEARCH_TERMS)}"
+        )
+    
+    def process(self) -> Tuple[int, int, int]:
+        """Fetch and process NOTAMs for the configured search terms."""
+        return self.process_searches()
     
     def process_searches(self) -> Tuple[int, int, int]:
         """
@@ -203,136 +537,100 @@ class SearchMonitor:
         """
         logger.info("Fetching NOTAMs via free-text search...")
         
-        # Fetch NOTAMs
-        notams = self.client.fetch_all_notams()
-        
-        if not notams:
-            logger.warning("No NOTAMs retrieved from API")
-            return 0, 0, 0
-        
-        logger.info(f"Retrieved {len(notams)} NOTAM(s), processing...")
+        # Process each NOTAM as its batch arrives
+        fetched = 0
         
-        # Process each NOTAM
-        inserted = 0
-        updated = 0
+        # Bound once for the loop; per-NOTAM lines are only built if logged
+        digester = self.alert_digester
+        digest_add = digester.add if digester else None
+        log_each = logger.isEnabledFor(logging.INFO)
+        # Tracebacks only for the first failure per cycle unless debugging
+        trace_all = logger.isEnabledFor(logging.DEBUG)
+        errors = 0
         
-        for raw_notam in notams:
-            try:
-                notam_obj = self.parser.parse_notam(raw_notam)
-                
-                if notam_obj:
-                    row_id, was_inserted = self.db.upsert_notam(notam_obj)
-                    
-                    if was_inserted:
-                        inserted += 1
-                    else:
-                        updated += 1
-
+        for batch in self._fetch_batches():
+            fetched += len(batch)
+            for notam_obj, was_inserted in self._store(batch):
+                try:
                     # Add to digest queue instead of sending immediately
-                    if self.alert_digester:
-                        self.alert_digester.add(notam_obj)
+                    if digest_add:
+                        digest_add(notam_obj)
                     
                     # Log at appropriate level
-                    log_msg = (
-                        f"{'Inserted' if was_inserted else 'Updated'}: {notam_obj.notam_id} | "
-                        f"{notam_obj.airport_code or notam_obj.location or 'N/A'} | "
-                        f"Term: {notam_obj.search_term or 'N/A'} | "
-                        f"Score: {notam_obj.priority_score}"
-                    )
+                    if log_each:
+                        logger.info(
+                            "%s: %s | %s | Term: %s | Score: %s%s",
+                            _VERBS[was_inserted],
+                            notam_obj.notam_id,
+                            notam_obj.display_location,
+                            notam_obj.search_term or 'N/A',
+                            notam_obj.priority_score,
+                            _FLAG_SUFFIXES[notam_obj.flags]
+                        )
                     
-                    if notam_obj.is_drone_related:
-                        log_msg += " [ DRONE]"
-                    if notam_obj.is_closure:
-                        log_msg += " [ CLOSURE]"
-                    
-                    logger.info(log_msg)
-                    
-            except Exception as e:
-                logger.error(f"Error processing NOTAM: {e}", exc_info=True)
+                except Exception as e:
+                    logger.error(
+                        "Error processing NOTAM %s: %s", notam_obj.notam_id, e,
+                        exc_info=trace_all or not errors
+                    )
+                    errors += 1
+            
+            # Send the digest early rather than let a large cycle grow it
+            # past MAX_PENDING
+            if digester and digester.should_flush():
+                digester.send_immediate()
+            
+        # Counted over the whole cycle, including NOTAMs stored by an
+        # attempt that was then retried
+        inserted = sum(self._cycle_stored.values())
+        updated = len(self._cycle_stored) - inserted
+        
+        # Nothing to record on an empty (e.g. off-hours) poll
+        if fetched == 0:
+            logger.warning("No NOTAMs retrieved from API")
+            return 0, 0, 0
         
         # Log search run (multiple terms combined)
         self.db.log_search_run(
             mode='search',
             search_term=','.join(self.config.SEARCH_TERMS),
-            total_fetched=len(notams),
+            total_fetched=fetched,
             new_inserted=inserted,
             updated=updated
         )
         
         logger.info(
-            f"Processing complete: {len(notams)} fetched, "
-            f"{inserted} new, {updated} updated"
+            "Processing complete: %d fetched, %d new, %d updated",
+            fetched, inserted, updated
         )
-        return len(notams), inserted, updated
+        return fetched, inserted, updated
     
-    def run_once(self):
-        """Run a single update cycle."""
-        logger.info("=" * 80)
-        logger.info("Starting NOTAM search cycle")
-        logger.info("=" * 80)
-        
-        start_time = time.time()
-        fetched, inserted, updated = self.process_searches()
-        elapsed = time.time() - start_time
-        
-        # Display statistics
-        stats = self.db.get_statistics()
-        logger.info("=" * 80)
-        logger.info("Database Statistics:")
-        logger.info(f"  Total NOTAMs in DB: {stats['total_notams']}")
-        logger.info(f"  Active NOTAMs: {stats['active_notams']}")
-        logger.info(f"  Closures: {stats['closures']}")
-        logger.info(f"  Active closures: {stats['active_closures']}")
-        logger.info(f"  Drone-related: {stats['drone_notams']}")
-        logger.info(f"  High priority (80+): {stats['high_priority']}")
-        logger.info(f"  Cycle time: {elapsed:.2f}s")
-        logger.info("=" * 80)
-        logger.info("Search cycle complete")
-        logger.info("=" * 80)
-        
-        return inserted
+    def _purge(self) -> None:
+        """Delete expired and cancelled NOTAMs and old search runs."""
+        super()._purge()
+        self.db.purge_old_search_runs()
     
-    def run_continuous(self):
-        """Run continuous monitoring with periodic updates."""
-        logger.info("Starting continuous search mode")
-        logger.info(f"Update interval: {self.config.UPDATE_INTERVAL_SECONDS}s")
-        
-        try:
-            while True:
-                self.run_once()
-                
-                # Run purge routines
-                self.db.purge_expired(self.config.PURGE_EXPIRED_AFTER_DAYS)
-                self.db.purge_cancelled(self.config.PURGE_CANCELLED_AFTER_DAYS)
-                self.db.purge_old_search_runs()
-                
-                logger.info(f"Next update in {self.config.UPDATE_INTERVAL_SECONDS}s...")
-                logger.info("")
-                time.sleep(self.config.UPDATE_INTERVAL_SECONDS)
-                
-        except KeyboardInterrupt:
-            logger.info("Search stopped by user")
-            # Send final digest on shutdown
-            if self.alert_digester:
-                self.alert_digester.send_immediate()
-        except Exception as e:
-            logger.error(f"Fatal error: {e}", exc_info=True)
-            sys.exit(1)
+    def shutdown(self) -> None:
+        """Release resources and send the final digest."""
+        super().shutdown()
+        # Send final digest on shutdown
+        if self.alert_digester:
+            self.alert_digester.send_immediate()
+
+
+# Command-line interface, built once at import
+_PARSER = argparse.ArgumentParser(description='NOTAM Monitor')
+_PARSER.add_argument('--once', action='store_true', help='Run once and exit')
+_PARSER.add_argument('--mode', choices=['airport', 'search', 'auto'], 
+                     default='auto', help='Monitoring mode')
 
 
 def main():
     """Main entry point."""
-    import argparse
-    
-    parser = argparse.ArgumentParser(description='NOTAM Monitor')
-    parser.add_argument('--once', action='store_true', help='Run once and exit')
-    parser.add_argument('--mode', choices=['airport', 'search', 'auto'], 
-                        default='auto', help='Monitoring mode')
-    
-    args = parser.parse_args()
+    args = _PARSER.parse_args()
     
     try:
-        config = Config()
+        config = Config
         
         # Determine mode
         if args.mode == 'airport':
@@ -346,7 +644,11 @@ def main():
                 monitor = NotamMonitor()
         
         if args.once:
-            monitor.run_once()
+            try:
+                monitor.run_once()
+            finally:
+                # Deliver queued alerts and the pending digest before exiting
+                monitor.shutdown()
         else:
             monitor.run_continuous()
             
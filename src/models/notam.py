@@ -3,7 +3,8 @@ import re
 import html
 from datetime import datetime
 from typing import Optional, Dict, Any, List
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field
+from functools import lru_cache
 from enum import Enum
 
 from src.config import Config
@@ -304,7 +305,80 @@ Q_CODE_CONDITIONS = {
 }
 
 
-@dataclass
+class _CodeLookup(dict):
+    """Q-code table copy whose misses return, and remember, "Unknown (XX)"."""
+
+    def __missing__(self, code: str) -> str:
+        value = self[code] = f"Unknown ({code})"
+        return value
+
+
+# Lookups used by the parser; unknown codes are formatted once, not per NOTAM
+_SUBJECT_LOOKUP = _CodeLookup(Q_CODE_SUBJECTS)
+_CONDITION_LOOKUP = _CodeLookup(Q_CODE_CONDITIONS)
+
+# Priority points for each NOTAM type (CANCEL gets 0)
+_TYPE_POINTS = {
+    NotamType.NEW: 10,
+    NotamType.REPLACE: 5,
+    NotamType.CANCEL: 0,
+}
+
+# Q-code conditions (letters 4+5) that mean the subject is closed
+_CLOSURE_CONDITION_CODES = frozenset({
+    'LC',  # Closed
+    'LI',  # Closed to IFR operations
+    'LN',  # Closed to all night operations
+    'LV',  # Closed to VFR operations
+})
+
+# Closure wording in the E) body, matched anywhere in one case-insensitive
+# pass. Phrases such as "ad clsd" or "runway closed" are covered by their
+# shorter keywords.
+_CLOSURE_PATTERN = re.compile(
+    r'closed|clsd|closure|not avbl|unavailable|suspended', re.IGNORECASE
+)
+
+# ICAO message field patterns, compiled once at import
+_NOTAM_ID_PATTERN = re.compile(r'([A-Z])(\d+)/(\d+)$')
+_REPLACES_PATTERN = re.compile(r'NOTAMR\s+([A-Z]\d+/\d+)')
+_CANCELS_PATTERN = re.compile(r'NOTAMC\s+([A-Z]\d+/\d+)')
+_Q_FIELD = re.compile(r'Q\)\s*([^)]+?)(?=\s+[A-Z]\)|\s*$)')
+_A_FIELD = re.compile(r'A\)\s*([^\s]+)')
+_B_FIELD = re.compile(r'B\)\s*(\d{10})')
+_C_FIELD = re.compile(r'C\)\s*(\d{10}|PERM)')
+_D_FIELD = re.compile(r'D\)\s*([^\n]+)')
+_E_FIELD = re.compile(r'E\)\s*(.*?)(?=\s*[F-G]\)|$)', re.DOTALL)
+_F_FIELD = re.compile(r'F\)\s*(.*?)(?=\s+[G-Z]\)|$)', re.DOTALL)
+_G_FIELD = re.compile(r'G\)\s*([^\n]+)')
+_FAA_DATE_SUFFIX = re.compile(r'\s*(EST|UTC|GMT)$')
+
+
+@lru_cache(maxsize=4096)
+def _parse_icao_datetime(date_str: str) -> Optional[datetime]:
+    """
+    Convert a 10-digit B)/C) value (YYMMDDHHMM, UTC) to a naive datetime.
+
+    Cached because a batch of NOTAMs repeats the same start/end times;
+    datetimes are immutable, so instances can share them.
+
+    Returns:
+        datetime, or None if the digits are not a valid date
+    """
+    yy = int(date_str[0:2])
+    try:
+        return datetime(
+            2000 + yy if yy < 50 else 1900 + yy,
+            int(date_str[2:4]),
+            int(date_str[4:6]),
+            int(date_str[6:8]),
+            int(date_str[8:10]),
+        )
+    except ValueError:
+        return None
+
+
+@dataclass(slots=True)
 class Notam:
     """Rich domain model for a NOTAM message following ICAO standards."""
 
@@ -358,13 +432,27 @@ class Notam:
     search_term: Optional[str] = None
     priority_score: int = 0
 
+    # Classification, computed once in __post_init__ (they scan the body
+    # text, and a parsed NOTAM's fields are not modified afterwards)
+    is_closure: bool = field(init=False, compare=False)
+    is_drone_related: bool = field(init=False, compare=False)
+    is_restriction: bool = field(init=False, compare=False)
+    is_trigger_notam: bool = field(init=False, compare=False)
+
+    # Bits of the flags property
+    FLAG_DRONE = 1
+    FLAG_CLOSURE = 2
+
     def __post_init__(self):
         """Calculate derived properties after initialization."""
+        self.is_closure = self._check_closure()
+        self.is_drone_related = self._check_drone_related()
+        self.is_restriction = self._check_restriction()
+        self.is_trigger_notam = self._check_trigger_notam()
         if self.priority_score == 0:
             self.priority_score = self._calculate_priority_score()
 
-    @property
-    def is_closure(self) -> bool:
+    def _check_closure(self) -> bool:
         """
         Check if NOTAM indicates a closure.
 
@@ -375,46 +463,24 @@ class Notam:
         """
         # Q-code based check (most reliable — structured ICAO data)
         if self.q_code and len(self.q_code) >= 5:
-            condition_code = self.q_code[3:5]
-            closure_condition_codes = {
-                'LC',  # Closed
-                'LI',  # Closed to IFR operations
-                'LN',  # Closed to all night operations
-                'LV',  # Closed to VFR operations
-            }
-            if condition_code in closure_condition_codes:
+            if self.q_code[3:5] in _CLOSURE_CONDITION_CODES:
                 return True
 
         # Body text keyword check (handles non-standard / plain language NOTAMs)
         if not self.body:
             return False
 
-        text_lower = self.body.lower()
-        closure_keywords = [
-            'closed', 'clsd', 'closure', 'not avbl',
-            'unavailable', 'suspended', 'ad clsd',
-            'airport closed', 'rwy closed', 'runway closed'
-        ]
-        return any(keyword in text_lower for keyword in closure_keywords)
+        return _CLOSURE_PATTERN.search(self.body) is not None
 
-    @property
-    def is_drone_related(self) -> bool:
+    def _check_drone_related(self) -> bool:
         """Check if NOTAM is drone-related."""
         if not self.body:
             return False
 
-        text_lower = self.body.lower()
-        config = Config()
-
-        for keyword in config.DRONE_KEYWORDS:
-            # Use word boundaries to match whole words only
-            pattern = r'\b' + re.escape(keyword.lower()) + r'\b'
-            if re.search(pattern, text_lower):
-                return True
-        return False
+        # Single precompiled whole-word alternation over all keywords
+        return Config.DRONE_PATTERN.search(self.body) is not None
 
-    @property
-    def is_restriction(self) -> bool:
+    def _check_restriction(self) -> bool:
         """
         Check if NOTAM indicates a restricted/prohibited/danger area.
 
@@ -444,13 +510,25 @@ class Notam:
 
         return False
 
-    @property
-    def is_trigger_notam(self) -> bool:
+    def _check_trigger_notam(self) -> bool:
         """Check if this is a TRIGGER NOTAM."""
         if not self.body:
             return False
         return self.body.strip().upper().startswith('TRIGGER NOTAM')
 
+    @property
+    def flags(self) -> int:
+        """Drone/closure classification packed as FLAG_DRONE | FLAG_CLOSURE bits."""
+        return (
+            self.FLAG_DRONE * self.is_drone_related
+            | self.FLAG_CLOSURE * self.is_closure
+        )
+
+    @property
+    def display_location(self) -> str:
+        """Airport code, else the A) location, else 'N/A' - for log lines."""
+        return self.airport_code or self.location or 'N/A'
+
     def _calculate_priority_score(self) -> int:
         """
         Calculate priority score based on additive rules.
@@ -467,21 +545,16 @@ class Notam:
         | is_trigger_notam is True     | -10    |
         | is_restriction (non-closure) | +20    |
         """
-        config = Config()
-        score = 0
+        config = Config
+        is_closure = self.is_closure
+        score = _TYPE_POINTS[self.notam_type]
 
-        if self.is_closure:
+        if is_closure:
             score += config.CLOSURE_SCORE
 
         if self.is_drone_related:
             score += config.DRONE_SCORE
 
-        if self.notam_type == NotamType.NEW:
-            score += 10
-        elif self.notam_type == NotamType.REPLACE:
-            score += 5
-        # CANCEL gets 0
-
         if self.scope and 'A' in self.scope:
             score += 10
 
@@ -491,7 +564,7 @@ class Notam:
         if self.is_trigger_notam:
             score -= 10
 
-        if self.is_restriction and not self.is_closure:
+        if not is_closure and self.is_restriction:
             score += config.RESTRICTION_SCORE
 
         return max(0, score)  # Ensure non-negative
@@ -513,37 +586,41 @@ class Notam:
         icao_message = data.get('icaoMessage', '')
 
         # Parse series, number, year from NOTAM ID (e.g. "A3097/25")
-        series = notam_id[0] if notam_id else ''
-        number = None
-        year = None
-
-        if '/' in notam_id:
-            num_part, year_part = notam_id.split('/')
-            if num_part and len(num_part) > 1:
-                series = num_part[0]
-                try:
-                    number = int(num_part[1:])
-                except (ValueError, IndexError):
-                    pass
-            try:
-                year = int(year_part)
-            except ValueError:
-                pass
+        id_match = _NOTAM_ID_PATTERN.match(notam_id)
+        if id_match:
+            series = id_match.group(1)
+            number = int(id_match.group(2))
+            year = int(id_match.group(3))
+        else:
+            # Non-standard ID: take whatever parts are well-formed
+            series = notam_id[0] if notam_id else ''
+            number = None
+            year = None
+            num_part, sep, year_part = notam_id.partition('/')
+            if sep:
+                if len(num_part) > 1:
+                    series = num_part[0]
+                    digits = num_part[1:].strip()
+                    if digits.isdecimal():
+                        number = int(digits)
+                year_part = year_part.strip()
+                if year_part.isdecimal():
+                    year = int(year_part)
 
         # Parse NOTAM type from first line of icaoMessage
         notam_type = NotamType.NEW
         replaces_notam_id = None
         cancels_notam_id = None
 
-        first_line = icao_message.split('\n')[0] if icao_message else ''
+        first_line = icao_message.partition('\n')[0]
         if 'NOTAMR' in first_line:
             notam_type = NotamType.REPLACE
-            match = re.search(r'NOTAMR\s+([A-Z]\d+/\d+)', first_line)
+            match = _REPLACES_PATTERN.search(first_line)
             if match:
                 replaces_notam_id = match.group(1)
         elif 'NOTAMC' in first_line:
             notam_type = NotamType.CANCEL
-            match = re.search(r'NOTAMC\s+([A-Z]\d+/\d+)', first_line)
+            match = _CANCELS_PATTERN.search(first_line)
             if match:
                 cancels_notam_id = match.group(1)
 
@@ -562,7 +639,7 @@ class Notam:
         q_code_subject = None
         q_code_condition = None
 
-        q_match = re.search(r'Q\)\s*([^)]+?)(?=\s+[A-Z]\)|\s*$)', icao_message)
+        q_match = _Q_FIELD.search(icao_message)
         if q_match:
             q_parts = q_match.group(1).strip().split('/')
             if len(q_parts) >= 8:
@@ -572,63 +649,36 @@ class Notam:
                 purpose = q_parts[3].strip() if len(q_parts) > 3 and q_parts[3] else None
                 scope = q_parts[4] if len(q_parts) > 4 else None
 
-                try:
-                    lower_limit = int(q_parts[5]) if len(q_parts) > 5 and q_parts[5].isdigit() else None
-                except (ValueError, IndexError):
-                    pass
+                # isdecimal() admits exactly what int() parses, so the
+                # numeric fields below need no try/except
+                lower_limit = int(q_parts[5]) if q_parts[5].isdecimal() else None
+                upper_limit = int(q_parts[6]) if q_parts[6].isdecimal() else None
 
-                try:
-                    upper_limit = int(q_parts[6]) if len(q_parts) > 6 and q_parts[6].isdigit() else None
-                except (ValueError, IndexError):
-                    pass
-
-                coordinates = q_parts[7] if len(q_parts) > 7 else None
+                coordinates = q_parts[7]
 
                 # Decode Q-code using the two SEPARATE lookup tables.
                 # Letters 2+3 → subject (what the NOTAM is about).
                 # Letters 4+5 → condition (the status of that subject).
                 if q_code and len(q_code) >= 5:
-                    subject_code = q_code[1:3]
-                    condition_code = q_code[3:5]
-                    q_code_subject = Q_CODE_SUBJECTS.get(
-                        subject_code, f"Unknown ({subject_code})"
-                    )
-                    q_code_condition = Q_CODE_CONDITIONS.get(
-                        condition_code, f"Unknown ({condition_code})"
-                    )
+                    q_code_subject = _SUBJECT_LOOKUP[q_code[1:3]]
+                    q_code_condition = _CONDITION_LOOKUP[q_code[3:5]]
 
                 # Parse coordinates: format 4904N00607E003 (lat°min + lon°min + radius NM)
-                if coordinates and len(coordinates) >= 11:
-                    lat_part = coordinates[:5] if len(coordinates) >= 5 else None
-                    if lat_part:
-                        try:
-                            lat_deg = int(lat_part[:2])
-                            lat_min = int(lat_part[2:4])
-                            lat_dir = lat_part[4]
-                            latitude = lat_deg + lat_min / 60.0
-                            if lat_dir in ('S', 's'):
-                                latitude = -latitude
-                        except (ValueError, IndexError):
-                            pass
+                if len(coordinates) >= 11:
+                    # Latitude: 4904N (49°04'N)
+                    if coordinates[:4].isdecimal():
+                        latitude = int(coordinates[:2]) + int(coordinates[2:4]) / 60.0
+                        if coordinates[4] in ('S', 's'):
+                            latitude = -latitude
 
                     # Longitude: 00607E (006°07'E)
-                    lon_part = coordinates[5:11] if len(coordinates) >= 11 else None
-                    if lon_part:
-                        try:
-                            lon_deg = int(lon_part[:3])
-                            lon_min = int(lon_part[3:5])
-                            lon_dir = lon_part[5]
-                            longitude = lon_deg + lon_min / 60.0
-                            if lon_dir in ('W', 'w'):
-                                longitude = -longitude
-                        except (ValueError, IndexError):
-                            pass
-
-                    if len(coordinates) >= 14:
-                        try:
-                            radius_nm = int(coordinates[11:14])
-                        except (ValueError, IndexError):
-                            pass
+                    if coordinates[5:10].isdecimal():
+                        longitude = int(coordinates[5:8]) + int(coordinates[8:10]) / 60.0
+                        if coordinates[10] in ('W', 'w'):
+                            longitude = -longitude
+
+                    if len(coordinates) >= 14 and coordinates[11:14].isdecimal():
+                        radius_nm = int(coordinates[11:14])
 
         # Parse lettered fields
         location = None
@@ -640,28 +690,19 @@ class Notam:
         lower_limit_text = None
         upper_limit_text = None
 
-        a_match = re.search(r'A\)\s*([^\s]+)', icao_message)
+        a_match = _A_FIELD.search(icao_message)
         if a_match:
             location = a_match.group(1)
 
-        b_match = re.search(r'B\)\s*(\d{10})', icao_message)
+        b_match = _B_FIELD.search(icao_message)
         if b_match:
-            date_str = b_match.group(1)
             # Format: YYMMDDHHMM (UTC)
-            try:
-                year_val = 2000 + int(date_str[0:2]) if int(date_str[0:2]) < 50 else 1900 + int(date_str[0:2])
-                month = int(date_str[2:4])
-                day = int(date_str[4:6])
-                hour = int(date_str[6:8])
-                minute = int(date_str[8:10])
-                valid_from = datetime(year_val, month, day, hour, minute)
-            except (ValueError, IndexError):
-                pass
+            valid_from = _parse_icao_datetime(b_match.group(1))
 
         # C) field: either a 10-digit datetime or PERM.
         # "EST" suffix (meaning "estimated") is intentionally stripped — the datetime
         # is still valid per ICAO; the NOTAM remains in force until cancelled/replaced.
-        c_match = re.search(r'C\)\s*(\d{10}|PERM)', icao_message)
+        c_match = _C_FIELD.search(icao_message)
         if c_match:
             date_str = c_match.group(1)
             if date_str == 'PERM':
@@ -669,31 +710,22 @@ class Notam:
                 valid_to = None
             else:
                 is_permanent = False
-                try:
-                    year_val = 2000 + int(date_str[0:2]) if int(date_str[0:2]) < 50 else 1900 + int(date_str[0:2])
-                    month = int(date_str[2:4])
-                    day = int(date_str[4:6])
-                    hour = int(date_str[6:8])
-                    minute = int(date_str[8:10])
-                    valid_to = datetime(year_val, month, day, hour, minute)
-                except (ValueError, IndexError):
-                    valid_to = None
-                    is_permanent = False
-
-        d_match = re.search(r'D\)\s*([^\n]+)', icao_message)
+                valid_to = _parse_icao_datetime(date_str)
+
+        d_match = _D_FIELD.search(icao_message)
         if d_match:
             schedule = d_match.group(1).strip()
 
-        e_match = re.search(r'E\)\s*(.*?)(?=\s*[F-G]\)|$)', icao_message, re.DOTALL)
+        e_match = _E_FIELD.search(icao_message)
         if e_match:
             body_text = e_match.group(1).strip()
             body = html.unescape(body_text)
 
-        f_match = re.search(r'F\)\s*(.*?)(?=\s+[G-Z]\)|$)', icao_message, re.DOTALL)
+        f_match = _F_FIELD.search(icao_message)
         if f_match:
             lower_limit_text = f_match.group(1).strip()
 
-        g_match = re.search(r'G\)\s*([^\n]+)', icao_message)
+        g_match = _G_FIELD.search(icao_message)
         if g_match:
             upper_limit_text = g_match.group(1).strip()
 
@@ -742,13 +774,11 @@ class Notam:
             source_type=data.get('sourceType'),
             raw_icao_message=icao_message,
             transaction_id=data.get('transactionID'),
-            has_history=data.get('hasHistory', False),
+            has_history=bool(data.get('hasHistory')),
             search_term=search_term,
         )
 
-        # Priority score is recalculated now that all fields are set
-        instance.priority_score = instance._calculate_priority_score()
-
+        # __post_init__ has already classified and scored the complete NOTAM
         return instance
 
     @staticmethod
@@ -760,7 +790,7 @@ class Notam:
         try:
             # Strip trailing timezone indicators (EST, UTC, GMT) — these are
             # informational only; all NOTAM times are UTC regardless.
-            date_str = re.sub(r'\s*(EST|UTC|GMT)$', '', date_str.strip())
+            date_str = _FAA_DATE_SUFFIX.sub('', date_str.strip())
 
             parts = date_str.split()
             if len(parts) >= 2:
@@ -790,7 +820,10 @@ class Notam:
         """Serialize to dictionary for database storage or JSON export."""
         result = {}
 
-        for key, value in asdict(self).items():
+        # Fields are flat values, so read them directly instead of through
+        # asdict()'s recursive deep copy
+        for key in self.__dataclass_fields__:
+            value = getattr(self, key)
             if isinstance(value, datetime):
                 result[key] = value.isoformat()
             elif isinstance(value, NotamType):
@@ -798,15 +831,64 @@ class Notam:
             else:
                 result[key] = value
 
-        # Computed properties are not dataclass fields — add them explicitly
-        result['is_closure'] = self.is_closure
-        result['is_drone_related'] = self.is_drone_related
-        result['is_restriction'] = self.is_restriction
-        result['is_trigger_notam'] = self.is_trigger_notam
-        result['priority_score'] = self.priority_score
-
         return result
 
+    def to_row(self) -> tuple:
+        """
+        Serialize to a positional tuple for the database upsert.
+
+        Values follow the notams table column order from notam_id through
+        has_history. Builds the tuple directly from attributes, skipping the
+        dict building and lookups of to_dict(). Flags are always
+        real bools, so int() converts them without a branch.
+        """
+        valid_from = self.valid_from
+        valid_to = self.valid_to
+        issue_date = self.issue_date
+
+        return (
+            self.notam_id,
+            self.series,
+            self.notam_type.value,
+            self.replaces_notam_id,
+            self.cancels_notam_id,
+            self.fir,
+            self.q_code,
+            self.q_code_subject,
+            self.q_code_condition,
+            self.traffic,
+            self.purpose,
+            self.scope,
+            self.lower_limit,
+            self.upper_limit,
+            self.coordinates,
+            self.latitude,
+            self.longitude,
+            self.radius_nm,
+            self.airport_code,
+            self.airport_name,
+            self.location,
+            valid_from.isoformat() if valid_from else None,
+            valid_to.isoformat() if valid_to else None,
+            int(self.is_permanent),
+            self.schedule,
+            self.body,
+            self.lower_limit_text,
+            self.upper_limit_text,
+            int(self.is_closure),
+            int(self.is_drone_related),
+            int(self.is_restriction),
+            int(self.is_trigger_notam),
+            self.search_term,
+            self.priority_score or 0,
+            self.source,
+            self.source_type,
+            issue_date.isoformat() if issue_date else None,
+            self.raw_icao_message,
+            self.transaction_id,
+            int(self.has_history),
+        )
+
     def summary(self) -> str:
         """Generate human-readable summary suitable for ntfy alert body."""
         lines = []
@@ -876,6 +958,6 @@ class Notam:
 
         return (
             f"<Notam {self.notam_id} "
-            f"{self.airport_code or self.location or 'N/A'} "
+            f"{self.display_location} "
             f"score={self.priority_score}{flag_str}>"
         )
\ No newline at end of file
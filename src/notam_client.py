@@ -1,17 +1,14 @@
 """NOTAM API client module with rate limiting and inheritance support."""
 import requests
+from requests.adapters import HTTPAdapter
 import time
 import random
-from typing import List, Dict, Optional, Set
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator, List, Dict, Optional, Set, Tuple
 from abc import ABC, abstractmethod
 from src.config import Config
 import logging
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s.%(msecs)03d | %(levelname)-8s | %(name)-20s | %(filename)-15s | %(funcName)-15s | %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S"
-)
 logger = logging.getLogger(__name__)
 
 
@@ -21,11 +18,23 @@ class BaseNotamClient(ABC):
     Allows for future implementations with different authentication methods.
     """
     
+    # Keep-alive connections held per host by the session's adapter
+    POOL_MAXSIZE = 10
+    
     def __init__(self):
-        self.config = Config()
+        self.config = Config
+        # One keep-alive session for the client's lifetime, so repeated
+        # requests to the FAA host skip the TCP/TLS handshake
         self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.POOL_MAXSIZE)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
         self._setup_authentication()
     
+    def close(self) -> None:
+        """Close the pooled HTTP connections."""
+        self.session.close()
+    
     @abstractmethod
     def _setup_authentication(self):
         """Setup authentication headers. Override in subclasses."""
@@ -50,11 +59,18 @@ class BaseNotamClient(ABC):
         """
         Fetch NOTAMs with error handling.
         
+        Rate limiting, server errors and connection failures are logged and
+        re-raised so the monitor can retry the cycle; other client errors
+        (e.g. an unknown airport) just yield no NOTAMs.
+        
         Args:
             **kwargs: Request-specific parameters
             
         Returns:
             List of NOTAM dictionaries
+            
+        Raises:
+            requests.exceptions.RequestException: On a transient request failure
         """
         try:
             url, headers, data = self._build_request(**kwargs)
@@ -71,18 +87,86 @@ class BaseNotamClient(ABC):
             return self._parse_response(response_data)
             
         except requests.exceptions.HTTPError as e:
-            if e.response.status_code == 429:
+            status = e.response.status_code
+            if status == 429:
                 logger.error(f"Rate limited. Consider increasing delays.")
             else:
                 logger.error(f"HTTP error fetching NOTAMs: {e}")
+            if status == 429 or status >= 500:
+                raise
             return []
         except requests.exceptions.RequestException as e:
             logger.error(f"Error fetching NOTAMs: {e}")
-            return []
+            raise
         except Exception as e:
             logger.error(f"Unexpected error: {e}")
             return []
     
+    def _fetch_each(self, fetch: Callable[[str], List[Dict]], items: List[str],
+                    label: str) -> Iterator[Tuple[str, List[Dict]]]:
+        """
+        Run fetch for every item, up to MAX_CONCURRENT_REQUESTS at a time.
+        
+        Each worker waits a random MIN/MAX_REQUEST_DELAY before every request
+        after its first, so the pacing holds per slot. With one slot this is
+        the plain sequential loop with a delay between requests.
+        
+        An item whose request fails is logged and yields no results, so one
+        bad airport or term doesn't abort the rest.
+        
+        Args:
+            fetch: Callable returning the NOTAMs for one item
+            items: Airports or search terms
+            label: Log format for one item, e.g. "Fetching NOTAMs for {}"
+            
+        Yields:
+            (item, results) pairs in input order, each as soon as it arrives
+            
+        Raises:
+            requests.exceptions.RequestException: If every request failed,
+                which points at an outage rather than a bad item
+        """
+        total = len(items)
+        workers = max(1, min(self.config.MAX_CONCURRENT_REQUESTS, total))
+        failures = []
+        
+        def paced(idx: int) -> List[Dict]:
+            if idx >= workers:
+                delay = random.uniform(
+                    self.config.MIN_REQUEST_DELAY,
+                    self.config.MAX_REQUEST_DELAY
+                )
+                logger.debug(f"  → Waiting {delay:.2f}s before next request")
+                time.sleep(delay)
+            logger.info(f"[{idx + 1}/{total}] {label.format(items[idx])}")
+            try:
+                return fetch(items[idx])
+            except requests.exceptions.RequestException as e:
+                logger.error(f"  → {items[idx]}: request failed, skipping ({e})")
+                failures.append(e)
+                return []
+        
+        if workers == 1:
+            for idx in range(total):
+                yield items[idx], paced(idx)
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                yield from zip(items, pool.map(paced, range(total)))
+        
+        if total and len(failures) == total:
+            raise failures[-1]
+    
+    def iter_all_notams(self) -> Iterator[Dict]:
+        """
+        Yield NOTAMs for all configured items (airports or search terms)
+        as each item's response arrives.
+        
+        Yields:
+            NOTAM dictionaries (deduplicated)
+        """
+        # This should be overridden by subclasses that need special handling
+        raise NotImplementedError
+    
     def fetch_all_notams(self) -> List[Dict]:
         """
         Fetch NOTAMs for all configured items (airports or search terms).
@@ -90,8 +174,7 @@ class BaseNotamClient(ABC):
         Returns:
             List of all NOTAM dictionaries (deduplicated)
         """
-        # This should be overridden by subclasses that need special handling
-        raise NotImplementedError
+        return list(self.iter_all_notams())
 
 
 class FAANotamClient(BaseNotamClient):
@@ -157,25 +240,25 @@ class FAANotamClient(BaseNotamClient):
         """Fetch NOTAMs for a specific airport."""
         return self.fetch_notams(airport_code=airport_code)
     
-    def fetch_all_notams(self) -> List[Dict]:
+    def iter_all_notams(self) -> Iterator[Dict]:
         """
-        Fetch NOTAMs for all configured airports with natural rate limiting.
+        Yield NOTAMs for all configured airports with natural rate limiting,
+        one airport's worth at a time.
         
-        Returns:
-            List of all NOTAM dictionaries
+        Yields:
+            NOTAM dictionaries (deduplicated)
         """
-        all_notams = []
         seen_ids: Set[str] = set()
-        total_airports = len(self.config.AIRPORTS)
+        airports = [code.strip() for code in self.config.AIRPORTS]
+        total_airports = len(airports)
         
         logger.info(f"Fetching NOTAMs for {total_airports} airport(s)")
         
-        for idx, airport_code in enumerate(self.config.AIRPORTS, 1):
-            airport_code = airport_code.strip()
-            
-            logger.info(f"[{idx}/{total_airports}] Fetching NOTAMs for {airport_code}")
-            notams = self.fetch_notams_for_airport(airport_code)
-            
+        results = self._fetch_each(
+            self.fetch_notams_for_airport, airports, "Fetching NOTAMs for {}"
+        )
+        
+        for airport_code, notams in results:
             if notams:
                 # Deduplicate
                 new_count = 0
@@ -183,23 +266,13 @@ class FAANotamClient(BaseNotamClient):
                     notam_id = notam.get('notamNumber')
                     if notam_id and notam_id not in seen_ids:
                         seen_ids.add(notam_id)
-                        all_notams.append(notam)
                         new_count += 1
-                logger.info(f"  → Retrieved {len(notams)} NOTAM(s), {new_count} new")
+                        yield notam
+                logger.info(f"  → {airport_code}: retrieved {len(notams)} NOTAM(s), {new_count} new")
             else:
-                logger.warning(f"  → No NOTAMs retrieved")
-            
-            # Add natural delay between requests (except for last one)
-            if idx < total_airports:
-                delay = random.uniform(
-                    self.config.MIN_REQUEST_DELAY, 
-                    self.config.MAX_REQUEST_DELAY
-                )
-                logger.debug(f"  → Waiting {delay:.2f}s before next request")
-                time.sleep(delay)
+                logger.warning(f"  → {airport_code}: no NOTAMs retrieved")
         
-        logger.info(f"Fetched {len(all_notams)} total NOTAM(s) from {total_airports} airport(s)")
-        return all_notams
+        logger.info(f"Fetched {len(seen_ids)} total NOTAM(s) from {total_airports} airport(s)")
 
 
 class FreeTextNotamClient(BaseNotamClient):
@@ -277,6 +350,9 @@ class FreeTextNotamClient(BaseNotamClient):
             
         Returns:
             List of NOTAM dictionaries
+            
+        Raises:
+            requests.exceptions.RequestException: If a page request fails
         """
         all_notams = []
         seen_ids: Set[str] = set()
@@ -327,47 +403,33 @@ class FreeTextNotamClient(BaseNotamClient):
                 logger.debug(f"  → Waiting {delay:.2f}s before next page")
                 time.sleep(delay)
                 
+            except requests.exceptions.RequestException as e:
+                logger.error(f"Error during pagination: {e}")
+                raise
             except Exception as e:
                 logger.error(f"Error during pagination: {e}")
                 break
         
         return all_notams
     
-    def fetch_all_notams(self) -> List[Dict]:
+    def iter_all_notams(self) -> Iterator[Dict]:
         """
-        Fetch NOTAMs for all configured search terms.
+        Yield NOTAMs for all configured search terms, one term's worth at a time.
         
-        Returns:
-            List of all NOTAM dictionaries (deduplicated)
+        Yields:
+            NOTAM dictionaries (deduplicated within each term)
         """
-        all_notams = []
-        seen_ids: Set[str] = set()
-        total_terms = len(self.config.SEARCH_TERMS)
+        total = 0
+        terms = [term.strip() for term in self.config.SEARCH_TERMS if term.strip()]
         
-        logger.info(f"Searching for {total_terms} free-text term(s)")
+        logger.info(f"Searching for {len(terms)} free-text term(s)")
         
-        for idx, term in enumerate(self.config.SEARCH_TERMS, 1):
-            term = term.strip()
-            if not term:
-                continue
-            
-            logger.info(f"[{idx}/{total_terms}] Searching for: '{term}'")
-            notams = self.search_term(term)
-            
-            # Add to results (already deduplicated within the search)
-            all_notams.extend(notams)
-            
-            # Rate limiting between terms (except last)
-            if idx < total_terms:
-                delay = random.uniform(
-                    self.config.MIN_REQUEST_DELAY,
-                    self.config.MAX_REQUEST_DELAY
-                )
-                logger.debug(f"→ Waiting {delay:.2f}s before next search term")
-                time.sleep(delay)
+        # Already deduplicated within each search
+        for _, notams in self._fetch_each(self.search_term, terms, "Searching for: '{}'"):
+            total += len(notams)
+            yield from notams
         
-        logger.info(f"Total: {len(all_notams)} unique NOTAMs across all search terms")
-        return all_notams
+        logger.info(f"Total: {total} unique NOTAMs across all search terms")
 
 
 class AuthenticatedNotamClient(BaseNotamClient):
@@ -376,6 +438,10 @@ class AuthenticatedNotamClient(BaseNotamClient):
     Use with access to a proper API with credentials.
     """
     
+    def __init__(self):
+        self._fallback: Optional[FAANotamClient] = None
+        super().__init__()
+    
     def _setup_authentication(self):
         """Setup Bearer token authentication."""
         if self.config.NOTAM_API_KEY:
@@ -408,11 +474,19 @@ class AuthenticatedNotamClient(BaseNotamClient):
             return response_data.get('notams', []) or response_data.get('items', [])
         return []
     
-    def fetch_all_notams(self) -> List[Dict]:
-        """Fetch NOTAMs for all configured airports (fallback to airport mode)."""
-        # Fallback to airport mode if no specific implementation
-        client = FAANotamClient()
-        return client.fetch_all_notams()
+    def iter_all_notams(self) -> Iterator[Dict]:
+        """Yield NOTAMs for all configured airports (fallback to airport mode)."""
+        # Fallback to airport mode if no specific implementation. The
+        # fallback client is kept so its connection pool survives cycles.
+        if self._fallback is None:
+            self._fallback = FAANotamClient()
+        return self._fallback.iter_all_notams()
+    
+    def close(self) -> None:
+        """Close the pooled HTTP connections, including the fallback's."""
+        super().close()
+        if self._fallback is not None:
+            self._fallback.close()
 
 
 # Factory function to get the appropriate client
@@ -427,7 +501,7 @@ def get_notam_client(mode: Optional[str] = None) -> BaseNotamClient:
     Returns:
         Instance of appropriate NotamClient subclass
     """
-    config = Config()
+    config = Config
     
     if mode is not None:
         if mode == 'airport':
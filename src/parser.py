@@ -13,7 +13,7 @@ class NotamParser:
     """Parses NOTAM data and returns Notam objects."""
     
     def __init__(self):
-        self.config = Config()
+        self.config = Config
     
     def parse_notam(self, notam_data: Dict) -> Optional[Notam]:
         """
@@ -1,8 +1,9 @@
 """Reports module for running custom queries."""
 import sys
 import os
+import time
 from pathlib import Path
-from src.database import NotamDatabase
+from src.database import NotamDatabase, SUMMARY_COLUMNS
 from src.config import Config
 from datetime import datetime
 
@@ -48,24 +49,27 @@ class ReportRunner:
         # Get column names
         columns = list(results[0].keys())
         
-        # Calculate column widths
-        widths = {col: len(col) for col in columns}
-        for row in results:
-            for col in columns:
-                val_len = len(str(row[col]))
-                if val_len > widths[col]:
-                    widths[col] = min(val_len, 100)  # Cap at 100 chars
+        # Stringify every cell once; widths and output both reuse it
+        cells = [[str(row[col]) for col in columns] for row in results]
+        
+        # Calculate column widths, capped at 100 chars
+        widths = [
+            max(len(col), min(max(len(cell) for cell in column), 100))
+            for col, column in zip(columns, zip(*cells))
+        ]
         
         # Print header
-        header = " | ".join(col.ljust(widths[col]) for col in columns)
-        separator = "-+-".join("-" * widths[col] for col in columns)
+        header = " | ".join(col.ljust(width) for col, width in zip(columns, widths))
+        separator = "-+-".join("-" * width for width in widths)
         
         print(header)
         print(separator)
         
         # Print rows
-        for row in results:
-            print(" | ".join(str(row[col])[:widths[col]].ljust(widths[col]) for col in columns))
+        print("\n".join(
+            " | ".join(cell[:width].ljust(width) for cell, width in zip(row, widths))
+            for row in cells
+        ))
         
         print(f"\n{len(results)} row(s) returned.\n")
     
@@ -91,7 +95,7 @@ class ReportRunner:
     def _report_active_notams(self) -> None:
         """Display all active NOTAMs."""
         print("\n=== Active NOTAMs (score >= 30) ===\n")
-        results = self.db.get_active_notams(min_score=30)
+        results = self.db.get_active_notams(min_score=30, columns=SUMMARY_COLUMNS)
         
         if results:
             display_results = []
@@ -112,7 +116,7 @@ class ReportRunner:
     def _report_closures(self) -> None:
         """Display closure NOTAMs."""
         print("\n=== Active Closures ===\n")
-        results = self.db.get_closures(active_only=True)
+        results = self.db.get_closures(active_only=True, columns=SUMMARY_COLUMNS + ('body',))
         
         if results:
             display_results = []
@@ -131,7 +135,7 @@ class ReportRunner:
     def _report_drone_notams(self) -> None:
         """Display drone-related NOTAMs."""
         print("\n=== Drone-Related NOTAMs ===\n")
-        results = self.db.get_drone_notams(active_only=True)
+        results = self.db.get_drone_notams(active_only=True, columns=SUMMARY_COLUMNS + ('body',))
         
         if results:
             display_results = []
@@ -150,7 +154,7 @@ class ReportRunner:
     def _report_priority(self) -> None:
         """Display high priority NOTAMs."""
         print("\n=== High Priority NOTAMs (score >= 50) ===\n")
-        results = self.db.get_active_notams(min_score=50)
+        results = self.db.get_active_notams(min_score=50, columns=SUMMARY_COLUMNS)
         
         if results:
             display_results = []
@@ -195,16 +199,17 @@ class ReportRunner:
             else:
                 term = choice
             
-            results = self.db.get_by_search_term(term)
+            results = self.db.get_by_search_term(term, columns=SUMMARY_COLUMNS + ('body',))
             
             if results:
+                now = datetime.now().isoformat()
                 display_results = []
                 for r in results:
                     display_results.append({
                         'ID': r['notam_id'],
                         'Airport': r['airport_code'] or r['location'] or 'N/A',
                         'Score': r['priority_score'],
-                        'Active': '✓' if (r['valid_to'] is None or r['valid_to'] > datetime.now().isoformat()) else '',
+                        'Active': '✓' if (r['valid_to'] is None or r['valid_to'] > now) else '',
                         'Body': r['body'][:60] if r['body'] else 'N/A',
                     })
                 self._display_results(display_results)
@@ -247,7 +252,7 @@ class ReportRunner:
             COUNT(*) as total_notams,
             SUM(CASE WHEN is_drone_related = 1 THEN 1 ELSE 0 END) as drone_notams,
             SUM(CASE WHEN is_closure = 1 THEN 1 ELSE 0 END) as closures,
-            SUM(CASE WHEN (valid_to IS NULL OR valid_to > datetime('now')) 
+            SUM(CASE WHEN (valid_to_ts IS NULL OR valid_to_ts > ?) 
                       AND (notam_type != 'CANCEL' OR notam_type IS NULL)
                  THEN 1 ELSE 0 END) as active_notams
         FROM notams
@@ -257,7 +262,7 @@ class ReportRunner:
         LIMIT 50
         """
         
-        results = self.db.execute_custom_query(query)
+        results = self.db.execute_custom_query(query, (int(time.time()),))
         self._display_results(results)
 
 
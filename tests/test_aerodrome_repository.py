@@ -0,0 +1,129 @@
+"""Unit tests for aerodrome repository."""
+import pytest
+import tempfile
+import os
+import csv
+from src.database import NotamDatabase
+from src.aerodrome_repository import AerodromeRepository
+from src.models.notam import Notam
+
+
+class TestAerodromeRepository:
+    """Test cases for AerodromeRepository class."""
+
+    @pytest.fixture
+    def db(self):
+        """Create a temporary database for testing."""
+        fd, path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+
+        database = NotamDatabase(path)
+
+        yield database
+
+        # Cleanup
+        try:
+            os.unlink(path)
+        except:
+            pass
+
+    @pytest.fixture
+    def repo(self, db):
+        """Create a repository backed by the temporary database."""
+        return AerodromeRepository(db)
+
+    @pytest.fixture
+    def sample_csv(self):
+        """Small OurAirports-format CSV file."""
+        fd, path = tempfile.mkstemp(suffix='.csv')
+        os.close(fd)
+
+        header = [
+            'id', 'ident', 'type', 'name', 'latitude_deg', 'longitude_deg',
+            'elevation_ft', 'continent', 'iso_country', 'iso_region',
+            'municipality', 'scheduled_service', 'gps_code', 'iata_code',
+            'local_code', 'home_link', 'wikipedia_link', 'keywords'
+        ]
+        rows = [
+            ['1', 'EKCH', 'large_airport', 'Copenhagen Kastrup Airport', '55.617', '12.656',
+             '17', 'EU', 'DK', 'DK-84', 'Copenhagen', 'yes', 'EKCH', 'CPH', '', '', '', ''],
+            ['2', 'KATL', 'large_airport', 'Hartsfield-Jackson Atlanta', '33.636', '-84.428',
+             '1026.0', 'NA', 'US', 'US-GA', 'Atlanta', 'yes', 'KATL', 'ATL', '', '', '', ''],
+            # Not an ICAO code - must be skipped
+            ['3', '00A', 'heliport', 'Total RF Heliport', '40.07', '-74.93',
+             '11', 'NA', 'US', 'US-PA', 'Bensalem', 'no', '00A', '', '00A', '', '', ''],
+        ]
+
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            writer.writerows(rows)
+
+        yield path
+
+        try:
+            os.unlink(path)
+        except:
+            pass
+
+    def test_load_from_csv(self, repo, sample_csv):
+        """Test bulk loading skips non-ICAO idents and maps countries."""
+        count = repo.load_from_csv(sample_csv)
+        assert count == 2
+
+        ekch = repo.get('ekch')
+        assert ekch is not None
+        assert ekch['name'] == 'Copenhagen Kastrup Airport'
+        assert ekch['country_name'] == 'Denmark'
+        assert ekch['source'] == 'ourairports'
+
+        katl = repo.get('KATL')
+        assert katl['elevation_ft'] == 1026
+
+        assert repo.get('00A') is None
+
+    def test_get_many(self, repo, sample_csv):
+        """Test batched lookup returns only known codes, keyed upper-case."""
+        repo.load_from_csv(sample_csv)
+
+        result = repo.get_many(['ekch', 'KATL', 'EKCH', 'ZZZZ', ''])
+
+        assert set(result.keys()) == {'EKCH', 'KATL'}
+        assert result['KATL']['iata_code'] == 'ATL'
+        assert repo.get_many([]) == {}
+
+    def test_enrich_notams_infers_unknown(self, repo, sample_csv):
+        """Test batch enrichment and inference of unknown aerodromes."""
+        repo.load_from_csv(sample_csv)
+
+        known = Notam.from_api_dict({
+            'notamNumber': 'A0001/25',
+            'facilityDesignator': 'EKCH',
+            'icaoMessage': 'A0001/25 NOTAMN\nE) RWY 12/30 CLSD',
+        })
+        unknown = Notam.from_api_dict({
+            'notamNumber': 'A0002/25',
+            'facilityDesignator': 'EGLL',
+            'airportName': 'HEATHROW',
+            'icaoMessage': 'A0002/25 NOTAMN\nE) TWY A CLSD',
+        })
+
+        enriched = repo.enrich_notams([known, unknown])
+
+        assert enriched['A0001/25']['name'] == 'Copenhagen Kastrup Airport'
+        assert enriched['A0002/25'] is None
+
+        inferred = repo.get('EGLL')
+        assert inferred is not None
+        assert inferred['name'] == 'HEATHROW'
+        assert inferred['source'] == 'notam_inference'
+
+    def test_lookup_without_preload(self, db, sample_csv):
+        """Test lookups fall back to the database when not preloaded."""
+        repo = AerodromeRepository(db, preload=False)
+        assert repo.get('EKCH') is None
+
+        repo.load_from_csv(sample_csv)
+
+        assert repo.get('EKCH')['iata_code'] == 'CPH'
+        assert set(repo.get_many(['EKCH', 'KATL']).keys()) == {'EKCH', 'KATL'}
@@ -2,8 +2,10 @@
 import pytest
 import tempfile
 import os
+import sqlite3
+import threading
 from datetime import datetime, timedelta
-from src.database import NotamDatabase
+from src.database import NotamDatabase, close_database, get_database
 from src.models.notam import Notam, NotamType
 
 
@@ -21,6 +23,7 @@ class TestNotamDatabase:
         yield database
         
         # Cleanup
+        database.close()
         try:
             os.unlink(path)
         except:
@@ -118,6 +121,66 @@ class TestNotamDatabase:
             result = cursor.fetchone()
             assert result is not None
     
+    def test_connection_reused(self, db):
+        """Test that connections are returned to the pool and reused."""
+        with db.get_connection() as conn:
+            first = conn
+        with db.get_connection() as conn:
+            assert conn is first
+    
+    def test_rollback_on_error(self, db, sample_notam_dict):
+        """Test that a failed block is rolled back before the connection is reused."""
+        notam = Notam.from_api_dict(sample_notam_dict)
+        with pytest.raises(RuntimeError):
+            with db.transaction() as conn:
+                conn.execute('INSERT INTO notams (notam_id) VALUES (?)', (notam.notam_id,))
+                raise RuntimeError('boom')
+        
+        with db.get_connection() as conn:
+            count = conn.execute('SELECT COUNT(*) FROM notams').fetchone()[0]
+            assert count == 0
+    
+    def test_reads_leave_no_transaction_open(self, db):
+        """Test that connections run in autocommit mode outside transaction()."""
+        db.get_statistics()
+        with db.get_connection() as conn:
+            conn.execute('SELECT COUNT(*) FROM notams').fetchone()
+            assert not conn.in_transaction
+        with db.transaction() as conn:
+            assert conn.in_transaction
+    
+    def test_transaction_groups_writes(self, db, sample_notam_dict, sample_drone_notam_dict):
+        """Test that writes inside a transaction commit or roll back together."""
+        notam1 = Notam.from_api_dict(sample_notam_dict)
+        notam2 = Notam.from_api_dict(sample_drone_notam_dict)
+        
+        with pytest.raises(RuntimeError):
+            with db.transaction():
+                db.upsert_notam(notam1)
+                raise RuntimeError('boom')
+        assert db.get_statistics()['total_notams'] == 0
+        
+        with db.transaction():
+            db.upsert_notam(notam1)
+            db.upsert_notam(notam2)
+        assert db.get_statistics()['total_notams'] == 2
+    
+    def test_reads_do_not_wait_for_writer(self, db, sample_notam_dict):
+        """Test that another thread can read while a write transaction is open."""
+        results = []
+        with db.transaction():
+            db.upsert_notam(Notam.from_api_dict(sample_notam_dict))
+            reader = threading.Thread(
+                target=lambda: results.append(db.get_statistics()['total_notams'])
+            )
+            reader.start()
+            reader.join(timeout=2)
+            assert not reader.is_alive()
+        
+        # The reader saw the last committed state, not the open transaction
+        assert results == [0]
+        assert db.get_statistics()['total_notams'] == 1
+    
     def test_upsert_notam_new(self, db, sample_notam_dict):
         """Test inserting a new NOTAM."""
         notam = Notam.from_api_dict(sample_notam_dict)
@@ -162,6 +225,34 @@ class TestNotamDatabase:
             result = cursor.fetchone()
             assert result['airport_name'] == 'UPDATED NAME'
     
+    def test_upsert_notams_batch(self, db, sample_notam_dict, sample_drone_notam_dict):
+        """Test batch upsert reports inserts and updates in input order."""
+        notam1 = Notam.from_api_dict(sample_notam_dict)
+        notam2 = Notam.from_api_dict(sample_drone_notam_dict)
+        
+        results = db.upsert_notams([notam1, notam2, notam1])
+        
+        assert [inserted for _, inserted in results] == [True, True, False]
+        assert results[0][0] == results[2][0]
+        assert db.get_statistics()['total_notams'] == 2
+    
+    def test_cancel_marks_target(self, db, sample_notam_dict):
+        """Test that re-ingesting a NOTAMC marks the NOTAM it cancels."""
+        target = Notam.from_api_dict(sample_notam_dict)
+        db.upsert_notam(target)
+        cancel = Notam(
+            notam_id='A9999/25', series='A', number=9999, year=2025,
+            notam_type=NotamType.CANCEL, cancels_notam_id=target.notam_id
+        )
+        
+        db.upsert_notam(cancel)
+        assert db.upsert_notam(cancel)[1] is False
+        
+        rows = db.execute_custom_query(
+            'SELECT notam_type FROM notams WHERE notam_id = ?', (target.notam_id,)
+        )
+        assert rows[0]['notam_type'] == 'CANCEL'
+    
     def test_get_active_notams(self, db, sample_notam_dict):
         """Test retrieving active NOTAMs."""
         notam = Notam.from_api_dict(sample_notam_dict)
@@ -198,6 +289,32 @@ class TestNotamDatabase:
     #     active = db.get_active_notams()
     #     assert len(active) >= 1
     
+    def test_large_batch_refreshes_statistics(self, db, sample_notam_dict, sample_drone_notam_dict):
+        """Test that a large upsert batch re-analyzes the notams table."""
+        db.ANALYZE_BATCH_SIZE = 2
+        db.upsert_notams([
+            Notam.from_api_dict(sample_notam_dict),
+            Notam.from_api_dict(sample_drone_notam_dict),
+        ])
+        
+        rows = db.execute_custom_query(
+            "SELECT COUNT(*) AS n FROM sqlite_stat1 WHERE tbl = 'notams'"
+        )
+        assert rows[0]['n'] > 0
+    
+    def test_active_filter_uses_valid_to(self, db):
+        """Test that expired NOTAMs are excluded from active listings."""
+        future = (datetime.utcnow() + timedelta(days=1)).isoformat()
+        past = (datetime.utcnow() - timedelta(days=1)).isoformat()
+        with db.get_connection() as conn:
+            conn.executemany(
+                'INSERT INTO notams (notam_id, valid_to) VALUES (?, ?)',
+                [('FUTURE', future), ('PAST', past), ('PERM', None)]
+            )
+        
+        active = {n['notam_id'] for n in db.get_active_notams()}
+        assert active == {'FUTURE', 'PERM'}
+    
     def test_get_closures(self, db, sample_notam_dict, sample_drone_notam_dict):
         """Test retrieving closures."""
         notam1 = Notam.from_api_dict(sample_notam_dict)
@@ -210,6 +327,28 @@ class TestNotamDatabase:
         assert len(closures) >= 2
         assert all(c['is_closure'] == 1 for c in closures)
     
+    def test_iter_closures_streams_rows(self, db, sample_notam_dict, sample_drone_notam_dict):
+        """Test that the streaming reader yields the same rows as the list API."""
+        db.upsert_notams([
+            Notam.from_api_dict(sample_notam_dict),
+            Notam.from_api_dict(sample_drone_notam_dict),
+        ])
+        
+        closures = db.iter_closures(active_only=False)
+        first = next(closures)
+        assert first == db.get_closures(active_only=False)[0]
+        closures.close()
+    
+    def test_column_projection(self, db, sample_notam_dict):
+        """Test that listings can select a subset of columns."""
+        db.upsert_notam(Notam.from_api_dict(sample_notam_dict))
+        
+        rows = db.get_closures(active_only=False, columns=('notam_id', 'priority_score'))
+        assert rows and set(rows[0]) == {'notam_id', 'priority_score'}
+        
+        with pytest.raises(ValueError):
+            db.get_closures(active_only=False, columns=('notam_id; DROP TABLE notams',))
+    
     def test_get_drone_notams(self, db, sample_notam_dict, sample_drone_notam_dict):
         """Test retrieving drone-related NOTAMs."""
         notam1 = Notam.from_api_dict(sample_notam_dict)
@@ -223,6 +362,18 @@ class TestNotamDatabase:
         assert all(d['is_drone_related'] == 1 for d in drone)
         assert any(d['notam_id'] == 'A0001/25' for d in drone)
     
+    def test_search_body(self, db, sample_notam_dict, sample_drone_notam_dict):
+        """Test full-text search over NOTAM bodies tracks inserts and deletes."""
+        drone = Notam.from_api_dict(sample_drone_notam_dict)
+        db.upsert_notams([Notam.from_api_dict(sample_notam_dict), drone])
+        
+        results = db.search_body('uas OR drone', active_only=False)
+        assert [r['notam_id'] for r in results] == [drone.notam_id]
+        
+        with db.get_connection() as conn:
+            conn.execute('DELETE FROM notams WHERE notam_id = ?', (drone.notam_id,))
+        assert db.search_body('uas OR drone', active_only=False) == []
+    
     def test_priority_ordering(self, db, sample_notam_dict, sample_drone_notam_dict):
         """Test that higher priority NOTAMs appear first."""
         notam1 = Notam.from_api_dict(sample_notam_dict)  # closure (60)
@@ -259,6 +410,15 @@ class TestNotamDatabase:
             assert result['new_inserted'] == 10
             assert result['updated'] == 5
     
+    def test_log_search_run_airports(self, db):
+        """Test that each searched airport gets its own indexed row."""
+        run_id = db.log_search_run(mode='airport', airport_codes=['EGLL', 'KJFK'])
+        
+        rows = db.execute_custom_query(
+            'SELECT run_id FROM search_run_airports WHERE airport_code = ?', ('EGLL',)
+        )
+        assert [r['run_id'] for r in rows] == [run_id]
+    
     def test_purge_expired(self, db, sample_notam_dict):
         """Test purging expired NOTAMs."""
         # Create NOTAM that expired 60 days ago
@@ -286,6 +446,57 @@ class TestNotamDatabase:
             result = cursor.fetchone()
             assert result['count'] == 0
     
+    def test_purge_expired_in_chunks(self, db):
+        """Test that purges loop over bounded chunks until done."""
+        db.PURGE_CHUNK_SIZE = 2
+        expired_date = (datetime.now() - timedelta(days=60)).isoformat()
+        with db.get_connection() as conn:
+            conn.executemany(
+                'INSERT INTO notams (notam_id, valid_to) VALUES (?, ?)',
+                [(f'OLD{i}', expired_date) for i in range(5)] + [('PERM', None)]
+            )
+        
+        assert db.purge_expired(days_after_expiry=30) == 5
+        assert db.get_statistics()['total_notams'] == 1
+    
+    def test_statistics_active_counts(self, db):
+        """Test that active counters skip expired and cancelled NOTAMs."""
+        future = (datetime.utcnow() + timedelta(days=1)).isoformat()
+        past = (datetime.utcnow() - timedelta(days=1)).isoformat()
+        with db.get_connection() as conn:
+            conn.executemany(
+                'INSERT INTO notams (notam_id, notam_type, valid_to, is_closure, '
+                'is_drone_related, priority_score) VALUES (?, ?, ?, ?, ?, ?)',
+                [
+                    ('ACTIVE', 'NEW', future, 1, 1, 90),
+                    ('EXPIRED', 'NEW', past, 1, 0, 80),
+                    ('CANCELLED', 'CANCEL', None, 0, 1, 10),
+                ]
+            )
+        
+        stats = db.get_statistics()
+        
+        assert stats == {
+            'total_notams': 3,
+            'active_notams': 1,
+            'closures': 2,
+            'active_closures': 1,
+            'drone_notams': 2,
+            'active_drone_notams': 1,
+            'high_priority': 2,
+        }
+    
+    def test_custom_query_is_read_only(self, db, sample_notam_dict):
+        """Test that custom queries can read but not modify the database."""
+        db.upsert_notam(Notam.from_api_dict(sample_notam_dict))
+        
+        rows = db.execute_custom_query('SELECT notam_id FROM notams')
+        assert rows == [{'notam_id': 'A3097/25'}]
+        
+        with pytest.raises(sqlite3.OperationalError):
+            db.execute_custom_query('DELETE FROM notams')
+        assert db.get_statistics()['total_notams'] == 1
+    
     def test_statistics(self, db, sample_notam_dict, sample_drone_notam_dict):
         """Test statistics retrieval."""
         notam1 = Notam.from_api_dict(sample_notam_dict)
@@ -299,4 +510,25 @@ class TestNotamDatabase:
         assert stats['total_notams'] >= 2
         assert stats['closures'] >= 2
         assert stats['drone_notams'] >= 1
-        assert stats['high_priority'] >= 1  # drone closure is 90
\ No newline at end of file
+        assert stats['high_priority'] >= 1  # drone closure is 90
+    
+    def test_get_database_shares_instance(self, db):
+        """Test that get_database returns one instance per file"""
+        shared = get_database(db.db_path)
+        same_file = os.path.join(os.path.dirname(db.db_path), '.', os.path.basename(db.db_path))
+        assert get_database(same_file) is shared
+        
+        fd, other_path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        other = get_database(other_path)
+        assert other is not shared
+        
+        close_database(db.db_path)
+        close_database(other_path)
+        os.unlink(other_path)
+        
+        # A closed path is evicted, so the next call opens a new instance
+        reopened = get_database(db.db_path)
+        assert reopened is not shared
+        assert reopened.get_statistics()['total_notams'] == 0
+        close_database(db.db_path)
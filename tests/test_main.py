@@ -1,6 +1,9 @@
 import pytest
+import requests
+import sqlite3
 from src.main import NotamMonitor
-# from src.config import Config
+from src.config import Config
+from src.database import close_database
 
 class TestNotamMonitor:
     """Test cases for NotamMonitor"""
@@ -14,4 +17,102 @@ class TestNotamMonitor:
         """Test that VERSION is not v0.0.0 when .env is loaded"""
         version = monitor.config.VERSION
         assert version is not None
-        assert version != "v0.0.0"
\ No newline at end of file
+        assert version != "v0.0.0"
+
+
+class TestRetry:
+    """Test that transient failures are retried"""
+
+    @pytest.fixture
+    def monitor(self, monkeypatch, tmp_path):
+        """Create an airport monitor on a temporary database"""
+        monkeypatch.setattr(Config, 'AIRPORTS', ['EKCH'])
+        monkeypatch.setattr(Config, 'VERSION', 'v1.0.0')
+        monkeypatch.setattr(Config, 'DATABASE_PATH', str(tmp_path / 'notam.db'))
+        monkeypatch.setattr(Config, 'NTFY_URL', '')
+        monkeypatch.setattr(Config, 'MAX_CONCURRENT_REQUESTS', 1)
+        monkeypatch.setattr('src.main.time.sleep', lambda seconds: None)
+        monitor = NotamMonitor()
+        yield monitor
+        monitor.client.close()
+        close_database(monitor.config.DATABASE_PATH)
+    
+    @staticmethod
+    def _response(notam_number):
+        """Fake FAA response carrying one closure NOTAM"""
+        raw_notam = {
+            "facilityDesignator": "EKCH",
+            "notamNumber": notam_number,
+            "issueDate": "01/01/2025 1200",
+            "startDate": "01/01/2025 1200",
+            "endDate": "PERM",
+            "icaoMessage": (
+                f"{notam_number} NOTAMN\n"
+                "Q) EKDK/QMRLC/IV/NBO/A/000/999/5537N01239E005\n"
+                "A) EKCH B) 2501011200 C) PERM\n"
+                "E) RWY 12/30 CLSD FOR TKOF AND LDG DUE TO WIP."
+            ),
+        }
+        
+        class Response:
+            def raise_for_status(self):
+                pass
+            
+            def json(self):
+                return [raw_notam]
+        
+        return Response()
+    
+    def test_transient_fetch_failure_is_retried(self, monitor):
+        """A dropped connection fails the attempt and the retry stores the NOTAM"""
+        calls = []
+        
+        def post(*args, **kwargs):
+            calls.append(args)
+            if len(calls) == 1:
+                raise requests.exceptions.ConnectionError("connection reset")
+            return self._response("A3097/25")
+        
+        monitor.client.session.post = post
+        
+        assert monitor._process_with_retry() == (1, 1, 0)
+        assert len(calls) == 2
+        stored = monitor.db.get_by_airport("EKCH", active_only=False)
+        assert [notam['notam_id'] for notam in stored] == ["A3097/25"]
+    
+    def test_failing_airport_is_skipped(self, monitor, monkeypatch):
+        """One airport that keeps failing doesn't stop the others being stored"""
+        monkeypatch.setattr(Config, 'AIRPORTS', ['EGLL', 'EKCH'])
+        calls = []
+        
+        def post(url, data=None, **kwargs):
+            calls.append(data['designatorsForLocation'])
+            if data['designatorsForLocation'] == 'EGLL':
+                raise requests.exceptions.ConnectionError("connection refused")
+            return self._response("A3097/25")
+        
+        monitor.client.session.post = post
+        
+        assert monitor._process_with_retry() == (1, 1, 0)
+        assert calls == ['EGLL', 'EKCH']
+    
+    def test_retry_does_not_repeat_stored_notams(self, monitor):
+        """NOTAMs stored before a failed attempt are counted and alerted once"""
+        monitor.client.session.post = lambda *args, **kwargs: self._response("A3097/25")
+        alerts = []
+        monitor.alerter.should_alert = lambda notam: True
+        monitor.alerter.enqueue = alerts.append
+        log_search_run = monitor.db.log_search_run
+        attempts = []
+        
+        def flaky_log_search_run(**kwargs):
+            attempts.append(kwargs)
+            if len(attempts) == 1:
+                raise sqlite3.OperationalError("database is locked")
+            return log_search_run(**kwargs)
+        
+        monitor.db.log_search_run = flaky_log_search_run
+        
+        assert monitor._process_with_retry() == (1, 1, 0)
+        assert len(attempts) == 2
+        assert [notam.notam_id for notam in alerts] == ["A3097/25"]
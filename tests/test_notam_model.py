@@ -143,6 +143,18 @@ class TestNotamModel:
         assert "'" in notam.body  # &apos; becomes '
         assert "&" in notam.body   # &amp; becomes &
     
+    def test_malformed_notam_id(self):
+        """Test that an ID with an extra slash still parses."""
+        data = {
+            "notamNumber": "A0012/25/1",
+            "icaoMessage": "A0012/25 NOTAMN\nE) TEST",
+        }
+        
+        notam = Notam.from_api_dict(data)
+        assert notam.series == "A"
+        assert notam.number == 12
+        assert notam.year is None
+    
     def test_is_permanent(self):
         """Test PERM handling."""
         data = {
@@ -193,6 +205,7 @@ class TestNotamModel:
         assert notam.is_drone_related is True
         # Closure (50) + Drone (30) + NEW (10) = 90
         assert notam.priority_score >= 90
+        assert notam.flags == Notam.FLAG_DRONE | Notam.FLAG_CLOSURE
     
     def test_summary_format(self):
         """Test summary generation."""
@@ -214,4 +227,17 @@ class TestNotamModel:
         assert "KATL" in summary
         assert "Hartsfield-Jackson" in summary
         assert "Priority Score:" in summary
-        assert len(summary) > 0
\ No newline at end of file
+        assert len(summary) > 0
+    
+    def test_to_row_matches_to_dict(self, sample_notamn):
+        """Test that the positional upsert row agrees with to_dict()."""
+        notam = Notam.from_api_dict(sample_notamn)
+        row = notam.to_row()
+        data = notam.to_dict()
+        
+        assert row[0] == data['notam_id']
+        assert row[2] == data['notam_type']
+        assert row[21] == data['valid_from']
+        assert row[28] == (1 if data['is_closure'] else 0)
+        assert row[33] == data['priority_score']
+        assert len(row) == 40
\ No newline at end of file